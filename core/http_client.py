@@ -0,0 +1,40 @@
+"""
+HTTP 客户端模块
+
+提供全局共享的 httpx.AsyncClient，使各插件的多次刷新复用同一连接池（keep-alive），
+避免每次请求都重新进行 TCP/TLS 握手。
+"""
+
+import httpx
+
+# 全局 HTTP 客户端，首次使用时创建
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    获取全局共享的异步 HTTP 客户端
+
+    Returns:
+        httpx.AsyncClient: 全局客户端实例
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """
+    关闭全局 HTTP 客户端
+
+    应在应用退出时调用以释放连接。
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
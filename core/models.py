@@ -9,6 +9,9 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
+# 状态严重程度，用于计算整体状态
+STATUS_PRIORITY = {"error": 2, "warning": 1, "normal": 0}
+
 
 class MetricData(BaseModel):
     """单个指标数据"""
@@ -44,11 +47,12 @@ class MonitorResult(BaseModel):
         if self.has_error:
             return "error"
 
-        status_priority = {"error": 2, "warning": 1, "normal": 0}
         max_status = "normal"
         for metric in self.metrics:
-            if status_priority.get(metric.status, 0) > status_priority.get(max_status, 0):
+            if STATUS_PRIORITY[metric.status] > STATUS_PRIORITY[max_status]:
                 max_status = metric.status
+                if max_status == "error":
+                    break
         return max_status
 
 
@@ -5,6 +5,7 @@
 """
 
 import importlib
+import logging
 import pkgutil
 from typing import TYPE_CHECKING
 
@@ -15,6 +16,8 @@ if TYPE_CHECKING:
     from plugins.interface import BaseMonitor
 
 
+logger = logging.getLogger(__name__)
+
 # 插件类型注册表
 PLUGIN_REGISTRY: dict[str, type["BaseMonitor"]] = {}
 
@@ -33,9 +36,22 @@ def register_plugin(plugin_type: str) -> type[type["BaseMonitor"]]:
 
     Returns:
         装饰器函数
+
+    Raises:
+        ValueError: 同一插件类型已注册为其他类
     """
 
     def decorator(cls: type["BaseMonitor"]) -> type["BaseMonitor"]:
+        existing = PLUGIN_REGISTRY.get(plugin_type)
+        # 按模块路径比较，允许模块重新加载时覆盖同一个类
+        if existing is not None and (existing.__module__, existing.__qualname__) != (
+            cls.__module__,
+            cls.__qualname__,
+        ):
+            raise ValueError(
+                f"插件类型 {plugin_type} 已注册为 "
+                f"{existing.__module__}.{existing.__qualname__}"
+            )
         PLUGIN_REGISTRY[plugin_type] = cls
         return cls
 
@@ -88,7 +104,7 @@ class PluginManager:
                     # 动态导入插件子包
                     importlib.import_module(f"plugins.{module_name}")
                 except ImportError as e:
-                    print(f"Warning: Failed to load plugin module '{module_name}': {e}")
+                    logger.warning("Failed to load plugin module '%s': %s", module_name, e)
 
         self._loaded = True
 
@@ -299,7 +315,7 @@ class PluginManager:
                     await instance.refresh()
                     results[service_id] = instance
                 except Exception as e:
-                    print(f"Error refreshing service '{service_id}': {e}")
+                    logger.warning("Error refreshing service '%s': %s", service_id, e)
         return results
 
     async def refresh_single_service(self, service_id: str) -> bool:
@@ -320,7 +336,7 @@ class PluginManager:
             await instance.refresh()
             return True
         except Exception as e:
-            print(f"Error refreshing service '{service_id}': {e}")
+            logger.warning("Error refreshing service '%s': %s", service_id, e)
             return False
 
     def update_service_credentials(
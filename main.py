@@ -22,6 +22,7 @@ os.environ.setdefault("FLET_LOG_LEVEL", "warning")
 import flet as ft
 
 from core.config_mgr import ConfigManager
+from core.http_client import close_http_client
 from core.plugin_mgr import PluginManager
 from core.security import SecurityManager
 from ui.components.nav import AppNavigationRail
@@ -63,6 +64,13 @@ class CloudMonitorApp:
         self.page.window.min_height = 600
         self.page.window.center()
 
+        # 会话关闭时释放共享的 HTTP 连接
+        self.page.on_close = self._on_close
+
+    async def _on_close(self, e: ft.ControlEvent) -> None:
+        """会话关闭时清理资源"""
+        await close_http_client()
+
     def _init_managers(self) -> None:
         """初始化管理器"""
         self.config_mgr = ConfigManager()
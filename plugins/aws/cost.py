@@ -12,6 +12,10 @@ from core.models import MetricData, MonitorResult
 from core.plugin_mgr import register_plugin
 from core.thread_utils import run_blocking
 from plugins.interface import BaseMonitor
+from ui.components.card import CARD_BGCOLOR, ERROR_CARD_BGCOLOR, KPI_PADDING, STATUS_COLORS
+
+# 卡片边框使用AWS 橙色
+CARD_BORDER = ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.ORANGE))
 
 
 @register_plugin("aws_cost")
@@ -22,6 +26,9 @@ class AWSCostMonitor(BaseMonitor):
     监控 AWS 账户的本月至今 (MTD) 费用。
     """
 
+    # 费用数据变化缓慢，连续未变化时逐步降低自动刷新频率
+    ADAPTIVE_POLLING: bool = True
+
     @property
     def plugin_id(self) -> str:
         return "aws_cost"
@@ -192,13 +199,7 @@ class AWSCostMonitor(BaseMonitor):
 
     def render_card(self, data: MonitorResult) -> ft.Control:
         """渲染 AWS 费用监控卡片"""
-        status_colors = {
-            "normal": ft.Colors.GREEN_400,
-            "warning": ft.Colors.AMBER,
-            "error": ft.Colors.RED,
-        }
-
-        color = status_colors.get(data.overall_status, ft.Colors.GREY)
+        color = STATUS_COLORS.get(data.overall_status, ft.Colors.GREY)
 
         # 获取主要 KPI
         main_metric = data.metrics[0] if data.metrics else None
@@ -265,7 +266,7 @@ class AWSCostMonitor(BaseMonitor):
                             ],
                             spacing=2,
                         ),
-                        padding=ft.Padding.symmetric(vertical=10),
+                        padding=KPI_PADDING,
                     ),
                     # 服务费用明细
                     ft.Text("服务明细", size=12, color=ft.Colors.WHITE_54),
@@ -294,8 +295,8 @@ class AWSCostMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
-            border=ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.ORANGE)),
+            bgcolor=CARD_BGCOLOR,
+            border=CARD_BORDER,
         )
 
     def _render_error_card(self, data: MonitorResult) -> ft.Control:
@@ -325,7 +326,7 @@ class AWSCostMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.RED),
+            bgcolor=ERROR_CARD_BGCOLOR,
         )
 
     def _shorten_service_name(self, name: str) -> str:
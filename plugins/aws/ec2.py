@@ -10,6 +10,18 @@ from core.models import MetricData, MonitorResult
 from core.plugin_mgr import register_plugin
 from core.thread_utils import run_blocking
 from plugins.interface import BaseMonitor
+from ui.components.card import CARD_BGCOLOR, ERROR_CARD_BGCOLOR, KPI_PADDING, STATUS_COLORS
+
+# 实例状态 -> 指示灯颜色
+STATE_COLORS = {
+    "running": ft.Colors.GREEN_400,
+    "stopped": ft.Colors.RED_400,
+    "pending": ft.Colors.AMBER,
+    "stopping": ft.Colors.AMBER,
+    "terminated": ft.Colors.GREY,
+}
+# 卡片边框使用AWS 橙色
+CARD_BORDER = ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.ORANGE))
 
 
 @register_plugin("aws_ec2")
@@ -186,21 +198,7 @@ class AWSEC2Monitor(BaseMonitor):
 
     def render_card(self, data: MonitorResult) -> ft.Control:
         """渲染 EC2 状态监控卡片"""
-        status_colors = {
-            "normal": ft.Colors.GREEN_400,
-            "warning": ft.Colors.AMBER,
-            "error": ft.Colors.RED,
-        }
-
-        state_colors = {
-            "running": ft.Colors.GREEN_400,
-            "stopped": ft.Colors.RED_400,
-            "pending": ft.Colors.AMBER,
-            "stopping": ft.Colors.AMBER,
-            "terminated": ft.Colors.GREY,
-        }
-
-        color = status_colors.get(data.overall_status, ft.Colors.GREY)
+        color = STATUS_COLORS.get(data.overall_status, ft.Colors.GREY)
 
         # 获取主要 KPI（运行中实例数）
         main_metric = data.metrics[0] if data.metrics else None
@@ -211,7 +209,7 @@ class AWSEC2Monitor(BaseMonitor):
         instance_rows = []
         for metric in data.metrics[2:8]:  # 跳过前两个统计指标，最多显示6个实例
             state = metric.value
-            state_color = state_colors.get(state, ft.Colors.GREY)
+            state_color = STATE_COLORS.get(state, ft.Colors.GREY)
 
             instance_rows.append(
                 ft.Row(
@@ -282,7 +280,7 @@ class AWSEC2Monitor(BaseMonitor):
                             ],
                             spacing=2,
                         ),
-                        padding=ft.Padding.symmetric(vertical=10),
+                        padding=KPI_PADDING,
                     ),
                     # 实例列表
                     *instance_rows,
@@ -310,8 +308,8 @@ class AWSEC2Monitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
-            border=ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.ORANGE)),
+            bgcolor=CARD_BGCOLOR,
+            border=CARD_BORDER,
         )
 
     def _render_error_card(self, data: MonitorResult) -> ft.Control:
@@ -341,5 +339,5 @@ class AWSEC2Monitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.RED),
+            bgcolor=ERROR_CARD_BGCOLOR,
         )
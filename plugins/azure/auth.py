@@ -0,0 +1,61 @@
+"""
+Azure 认证工具
+
+在所有 Azure 插件之间共享 ClientSecretCredential，使相同凭据只需获取一次 OAuth 令牌。
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from azure.identity import ClientSecretCredential
+
+# (tenant_id, client_id, client_secret) 的摘要 -> 凭据实例，避免在内存中以密钥明文作为键。
+# 按最近使用顺序保存，超出上限时关闭最久未用的凭据
+_credential_cache: OrderedDict[str, "ClientSecretCredential"] = OrderedDict()
+_credential_lock = threading.Lock()
+# 缓存的凭据数量上限，防止密钥轮换或频繁修改配置时旧凭据持续累积
+MAX_CACHED_CREDENTIALS = 8
+
+
+def get_credential(
+    tenant_id: str,
+    client_id: str,
+    client_secret: str,
+) -> "ClientSecretCredential":
+    """
+    获取共享的 ClientSecretCredential
+
+    凭据实例内部缓存访问令牌（有效期约 1 小时），相同凭据的插件复用同一实例，
+    避免各自发起令牌请求。缓存最多保留 MAX_CACHED_CREDENTIALS 个凭据，超出时关闭
+    最久未使用的凭据。可在线程池中并发调用。
+
+    Args:
+        tenant_id: 租户 ID
+        client_id: 应用（客户端）ID
+        client_secret: 客户端密钥
+
+    Returns:
+        ClientSecretCredential: 凭据实例
+    """
+    from azure.identity import ClientSecretCredential
+
+    key = hashlib.sha256("\0".join((tenant_id, client_id, client_secret)).encode()).hexdigest()
+    with _credential_lock:
+        credential = _credential_cache.get(key)
+        if credential is not None:
+            _credential_cache.move_to_end(key)
+            return credential
+
+        credential = ClientSecretCredential(
+            tenant_id=tenant_id,
+            client_id=client_id,
+            client_secret=client_secret,
+        )
+        _credential_cache[key] = credential
+        while len(_credential_cache) > MAX_CACHED_CREDENTIALS:
+            _, evicted = _credential_cache.popitem(last=False)
+            evicted.close()
+        return credential
@@ -11,7 +11,12 @@ import flet as ft
 from core.models import MetricData, MonitorResult
 from core.plugin_mgr import register_plugin
 from core.thread_utils import run_blocking
+from plugins.azure.auth import get_credential
 from plugins.interface import BaseMonitor
+from ui.components.card import CARD_BGCOLOR, ERROR_CARD_BGCOLOR, KPI_PADDING, STATUS_COLORS
+
+# 卡片边框使用Azure 蓝色
+CARD_BORDER = ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.BLUE))
 
 
 @register_plugin("azure_cost")
@@ -22,6 +27,9 @@ class AzureCostMonitor(BaseMonitor):
     监控 Azure 订阅的本月费用。
     """
 
+    # 费用数据变化缓慢，连续未变化时逐步降低自动刷新频率
+    ADAPTIVE_POLLING: bool = True
+
     @property
     def plugin_id(self) -> str:
         return "azure_cost"
@@ -88,7 +96,6 @@ class AzureCostMonitor(BaseMonitor):
     ) -> MonitorResult:
         """同步获取费用数据（在线程池中执行）"""
         from azure.core.exceptions import AzureError, ClientAuthenticationError, HttpResponseError
-        from azure.identity import ClientSecretCredential
         from azure.mgmt.costmanagement import CostManagementClient
         from azure.mgmt.costmanagement.models import (
             ExportType,
@@ -101,11 +108,7 @@ class AzureCostMonitor(BaseMonitor):
         )
 
         try:
-            credential = ClientSecretCredential(
-                tenant_id=tenant_id,
-                client_id=client_id,
-                client_secret=client_secret,
-            )
+            credential = get_credential(tenant_id, client_id, client_secret)
 
             cost_client = CostManagementClient(
                 credential=credential,
@@ -201,12 +204,7 @@ class AzureCostMonitor(BaseMonitor):
 
     def render_card(self, data: MonitorResult) -> ft.Control:
         """渲染 Azure 费用监控卡片"""
-        status_colors = {
-            "normal": ft.Colors.GREEN_400,
-            "warning": ft.Colors.AMBER,
-            "error": ft.Colors.RED,
-        }
-        color = status_colors.get(data.overall_status, ft.Colors.GREY)
+        color = STATUS_COLORS.get(data.overall_status, ft.Colors.GREY)
 
         main_metric = data.metrics[0] if data.metrics else None
         if not main_metric:
@@ -254,7 +252,7 @@ class AzureCostMonitor(BaseMonitor):
                             ],
                             spacing=2,
                         ),
-                        padding=ft.Padding.symmetric(vertical=10),
+                        padding=KPI_PADDING,
                     ),
                     ft.Text("资源组明细", size=12, color=ft.Colors.WHITE_54),
                     *rg_rows,
@@ -273,8 +271,8 @@ class AzureCostMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
-            border=ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.BLUE)),
+            bgcolor=CARD_BGCOLOR,
+            border=CARD_BORDER,
         )
 
     def _render_error_card(self, data: MonitorResult) -> ft.Control:
@@ -299,7 +297,7 @@ class AzureCostMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.RED),
+            bgcolor=ERROR_CARD_BGCOLOR,
         )
 
     def _shorten_rg_name(self, name: str) -> str:
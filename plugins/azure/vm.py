@@ -4,12 +4,62 @@ Azure VM 状态监控插件
 使用 Azure SDK 监控虚拟机的运行状态。
 """
 
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import TYPE_CHECKING, Literal
+
 import flet as ft
 
 from core.models import MetricData, MonitorResult
 from core.plugin_mgr import register_plugin
 from core.thread_utils import run_blocking
+from plugins.azure.auth import get_credential
 from plugins.interface import BaseMonitor
+from ui.components.card import CARD_BGCOLOR, ERROR_CARD_BGCOLOR, KPI_PADDING, STATUS_COLORS
+
+if TYPE_CHECKING:
+    from azure.mgmt.compute import ComputeManagementClient
+
+# 从资源 ID 中提取资源组名称，如 /subscriptions/xxx/resourceGroups/<rg>/providers/...
+RESOURCE_GROUP_PATTERN = re.compile(r"/resourceGroups/([^/]+)", re.IGNORECASE)
+
+# 视为已停止的电源状态
+STOPPED_STATES = frozenset({"deallocated", "stopped"})
+# 视为正常（非过渡/未知）的电源状态
+NORMAL_STATES = STOPPED_STATES | {"running"}
+
+# 电源状态 -> (指标状态, 卡片指示灯颜色)
+STATE_META: dict[str, tuple[str, str]] = {
+    "running": ("normal", ft.Colors.GREEN_400),
+    "deallocated": ("error", ft.Colors.GREY),
+    "stopped": ("error", ft.Colors.RED_400),
+    "starting": ("warning", ft.Colors.AMBER),
+    "stopping": ("warning", ft.Colors.AMBER),
+    "unknown": ("warning", ft.Colors.GREY),
+}
+DEFAULT_STATE_META = ("warning", ft.Colors.GREY)
+
+# 结果中汇总指标（运行中 / 已停止）的数量，其后为逐台 VM 的明细指标
+SUMMARY_METRIC_COUNT = 2
+# 卡片中最多展示的 VM 明细行数
+MAX_VISIBLE_VMS = 5
+# 卡片边框使用 Azure 蓝色
+CARD_BORDER = ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.BLUE))
+
+
+@dataclass
+class VMTable:
+    """VM 清单列式存储，每个字段一个列表，按下标对齐"""
+
+    names: list[str] = field(default_factory=list)
+    sizes: list[str] = field(default_factory=list)
+    states: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.names)
 
 
 @register_plugin("azure_vm")
@@ -20,6 +70,22 @@ class AzureVMMonitor(BaseMonitor):
     监控 Azure 虚拟机的运行状态。
     """
 
+    # VM 清单（名称、资源组、规格、区域）缓存有效期（秒），电源状态每次轮询都会刷新
+    INVENTORY_TTL: float = 300.0
+    # 同时进行中的 instance_view 请求上限。共享线程池只有 10 个线程，
+    # 保持在其一半以下，为其他插件的阻塞调用留出线程，同时避免触发 ARM 限流 (429)
+    MAX_CONCURRENT_REQUESTS: int = 4
+    # 数据粒度：
+    # - "detail": 列出 VM 清单后逐台查询 instance_view，可展示规格等明细
+    # - "summary": 仅调用一次 list_all(statusOnly=true)，适合只需要 KPI 计数的场景
+    DETAIL_LEVEL: Literal["summary", "detail"] = "detail"
+
+    def __init__(self, service_id: str, alias: str, credentials: dict[str, str]) -> None:
+        super().__init__(service_id, alias, credentials)
+        self._inventory_cache: tuple[float, list] | None = None
+        # (凭据, 客户端)，跨轮询复用底层 HTTP 连接池
+        self._compute_client: tuple[tuple[str, ...], ComputeManagementClient] | None = None
+
     @property
     def plugin_id(self) -> str:
         return "azure_vm"
@@ -55,94 +121,135 @@ class AzureVMMonitor(BaseMonitor):
             return self._create_error_result("未配置 Azure 凭据")
 
         try:
-            result = await run_blocking(
-                self._fetch_vms_sync,
+            return await self._fetch_vms(
                 tenant_id,
                 client_id,
                 client_secret,
                 subscription_id,
             )
-            return result
         except Exception as e:
             return self._create_error_result(f"获取VM状态失败: {e!s}")
 
-    def _fetch_vms_sync(
+    async def _fetch_vms(
         self,
         tenant_id: str,
         client_id: str,
         client_secret: str,
         subscription_id: str,
     ) -> MonitorResult:
-        """同步获取VM数据（在线程池中执行）"""
+        """获取 VM 清单，并发查询各 VM 的电源状态"""
         from azure.core.exceptions import AzureError, ClientAuthenticationError
-        from azure.identity import ClientSecretCredential
-        from azure.mgmt.compute import ComputeManagementClient
 
         try:
-            credential = ClientSecretCredential(
-                tenant_id=tenant_id,
-                client_id=client_id,
-                client_secret=client_secret,
+            # SDK 导入与客户端构建均为同步操作，放到线程池中执行，避免阻塞事件循环
+            compute_client = await run_blocking(
+                self._get_compute_client,
+                tenant_id,
+                client_id,
+                client_secret,
+                subscription_id,
             )
 
-            compute_client = ComputeManagementClient(
-                credential=credential,
-                subscription_id=subscription_id,
+            if self.DETAIL_LEVEL == "summary":
+                # statusOnly 列表已包含每台 VM 的 instance_view，一次调用即可得到全部电源状态
+                vms = await run_blocking(self._list_vm_statuses, compute_client)
+                states = [self._extract_power_state(vm.instance_view) for vm in vms]
+                return self._parse_vm_list(vms, states)
+
+            vms = await run_blocking(self._get_vm_inventory, compute_client)
+            resource_groups = [self._parse_resource_group(vm.id) for vm in vms]
+            # 各 VM 的 instance_view 互不依赖，分别提交到线程池并发执行
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+            async def bounded_power_state(resource_group: str, vm_name: str) -> str:
+                async with semaphore:
+                    return await run_blocking(
+                        self._get_power_state, compute_client, resource_group, vm_name
+                    )
+
+            results = await asyncio.gather(
+                *(
+                    bounded_power_state(resource_group, vm.name)
+                    for vm, resource_group in zip(vms, resource_groups, strict=True)
+                ),
+                return_exceptions=True,
             )
-
-            vms = list(compute_client.virtual_machines.list_all())
-            return self._parse_vm_list(vms, compute_client)
+            # 单台 VM 查询失败不影响整体结果，标记为 unknown，并在下次轮询时重新列出清单
+            if any(isinstance(result, Exception) for result in results):
+                self._inventory_cache = None
+            states = ["unknown" if isinstance(result, Exception) else result for result in results]
+            return self._parse_vm_list(vms, states)
 
         except ClientAuthenticationError:
+            self._inventory_cache = None
             return self._create_error_result("Azure 凭据无效")
         except AzureError as e:
+            self._inventory_cache = None
             return self._create_error_result(f"Azure 错误: {e!s}")
 
-    def _parse_vm_list(self, vms: list, compute_client: object) -> MonitorResult:
-        """解析 VM 列表"""
-        from azure.core.exceptions import AzureError
+    def _get_compute_client(
+        self,
+        tenant_id: str,
+        client_id: str,
+        client_secret: str,
+        subscription_id: str,
+    ) -> "ComputeManagementClient":
+        """获取 ComputeManagementClient，凭据不变时跨轮询复用，凭据变化时关闭旧客户端"""
+        from azure.mgmt.compute import ComputeManagementClient
 
-        instances: list[dict] = []
-
-        for vm in vms:
-            resource_group = ""
-            if vm.id:
-                parts = vm.id.split("/")
-                for i, part in enumerate(parts):
-                    if part.lower() == "resourcegroups" and i + 1 < len(parts):
-                        resource_group = parts[i + 1]
-                        break
-
-            power_state = "unknown"
-            try:
-                instance_view = compute_client.virtual_machines.instance_view(
-                    resource_group_name=resource_group,
-                    vm_name=vm.name,
-                )
-                for status in instance_view.statuses or []:
-                    if status.code and status.code.startswith("PowerState/"):
-                        power_state = status.code.replace("PowerState/", "")
-                        break
-            except AzureError:
-                pass
-
-            instances.append(
-                {
-                    "name": vm.name,
-                    "resource_group": resource_group,
-                    "location": vm.location,
-                    "size": vm.hardware_profile.vm_size if vm.hardware_profile else "",
-                    "state": power_state,
-                }
-            )
+        key = (tenant_id, client_id, client_secret, subscription_id)
+        if self._compute_client is not None:
+            cached_key, client = self._compute_client
+            if cached_key == key:
+                return client
+            client.close()
+
+        # 缩短 LRO 轮询间隔（SDK 默认 30 秒），并减少重试次数，
+        # 遇到限流时快速失败，避免单次轮询被默认的 10 次重试拖长到数分钟
+        client = ComputeManagementClient(
+            credential=get_credential(tenant_id, client_id, client_secret),
+            subscription_id=subscription_id,
+            polling_interval=5,
+            retry_total=2,
+            retry_backoff_factor=0.5,
+        )
+        self._compute_client = (key, client)
+        return client
+
+    def _get_vm_inventory(self, compute_client: object) -> list:
+        """获取 VM 清单，在 INVENTORY_TTL 内复用上次 list_all() 的结果"""
+        now = time.monotonic()
+        if self._inventory_cache is not None:
+            cached_at, vms = self._inventory_cache
+            if now - cached_at < self.INVENTORY_TTL:
+                return vms
+
+        vms = list(compute_client.virtual_machines.list_all())
+        self._inventory_cache = (now, vms)
+        return vms
+
+    def _list_vm_statuses(self, compute_client: object) -> list:
+        """一次性列出订阅下所有 VM 及其电源状态"""
+        return list(compute_client.virtual_machines.list_all(status_only="true"))
+
+    def _parse_vm_list(self, vms: list, states: list[str]) -> MonitorResult:
+        """解析 VM 列表及对应的电源状态"""
+        table = VMTable(
+            names=[vm.name for vm in vms],
+            sizes=[vm.hardware_profile.vm_size if vm.hardware_profile else "" for vm in vms],
+            states=states,
+        )
 
-        running_count = sum(1 for i in instances if i["state"] == "running")
-        stopped_count = sum(1 for i in instances if i["state"] in ("deallocated", "stopped"))
-        total_count = len(instances)
+        # list.count / issuperset 均在 C 层遍历，避免逐项执行 Python 字节码
+        running_count = table.states.count("running")
+        stopped_count = sum(map(table.states.count, STOPPED_STATES))
+        # starting/stopping/unknown 等过渡或未知状态视为异常
+        has_abnormal = not NORMAL_STATES.issuperset(table.states)
+        total_count = len(table)
 
         if running_count == 0 and total_count > 0:
             status = "warning"
-        elif any(i["state"] not in ("running", "deallocated", "stopped") for i in instances):
+        elif has_abnormal:
             status = "warning"
         else:
             status = "normal"
@@ -162,46 +269,70 @@ class AzureVMMonitor(BaseMonitor):
             ),
         ]
 
-        for inst in instances[:5]:
-            state_status = "normal" if inst["state"] == "running" else "warning"
-            if inst["state"] in ("deallocated", "stopped"):
-                state_status = "error"
+        # 仅为卡片中可见的 VM 构建 MetricData
+        visible = islice(zip(table.names, table.states, table.sizes, strict=True), MAX_VISIBLE_VMS)
+        for name, state, size in visible:
+            state_status, _ = STATE_META.get(state, DEFAULT_STATE_META)
             metrics.append(
                 MetricData(
-                    label=inst["name"][:20],
-                    value=inst["state"],
-                    unit=self._shorten_vm_size(inst["size"]),
+                    label=name[:20],
+                    value=state,
+                    unit=self._shorten_vm_size(size),
                     status=state_status,
                 )
             )
 
         return self._create_success_result(metrics)
 
+    @staticmethod
+    def _parse_resource_group(resource_id: str | None) -> str:
+        """从资源 ID 中提取资源组名称"""
+        match = RESOURCE_GROUP_PATTERN.search(resource_id) if resource_id else None
+        return match.group(1) if match else ""
+
+    def _get_power_state(
+        self,
+        compute_client: object,
+        resource_group: str,
+        vm_name: str,
+    ) -> str:
+        """查询单个 VM 的电源状态，失败时返回 unknown 并丢弃 VM 清单缓存"""
+        from azure.core.exceptions import AzureError
+
+        try:
+            instance_view = compute_client.virtual_machines.instance_view(
+                resource_group_name=resource_group,
+                vm_name=vm_name,
+            )
+        except AzureError:
+            # VM 可能已被删除或移动，下次轮询重新列出清单，避免在 INVENTORY_TTL 内持续显示 unknown
+            self._inventory_cache = None
+            return "unknown"
+
+        return self._extract_power_state(instance_view)
+
+    @staticmethod
+    def _extract_power_state(instance_view: object | None) -> str:
+        """从 instance_view 的状态列表中提取电源状态"""
+        statuses = getattr(instance_view, "statuses", None) or []
+        for status in statuses:
+            if status.code and status.code.startswith("PowerState/"):
+                return status.code.replace("PowerState/", "")
+        return "unknown"
+
     def render_card(self, data: MonitorResult) -> ft.Control:
         """渲染 Azure VM 状态监控卡片"""
-        status_colors = {
-            "normal": ft.Colors.GREEN_400,
-            "warning": ft.Colors.AMBER,
-            "error": ft.Colors.RED,
-        }
-        state_colors = {
-            "running": ft.Colors.GREEN_400,
-            "deallocated": ft.Colors.GREY,
-            "stopped": ft.Colors.RED_400,
-            "starting": ft.Colors.AMBER,
-            "stopping": ft.Colors.AMBER,
-            "unknown": ft.Colors.GREY,
-        }
-
-        color = status_colors.get(data.overall_status, ft.Colors.GREY)
+        color = STATUS_COLORS.get(data.overall_status, ft.Colors.GREY)
         main_metric = data.metrics[0] if data.metrics else None
         if not main_metric:
             return self._render_error_card(data)
 
         instance_rows = []
-        for metric in data.metrics[2:8]:
-            state = metric.value
-            state_color = state_colors.get(state, ft.Colors.GREY)
+        visible_metrics = islice(
+            data.metrics, SUMMARY_METRIC_COUNT, SUMMARY_METRIC_COUNT + MAX_VISIBLE_VMS
+        )
+        for metric in visible_metrics:
+            _, state_color = STATE_META.get(metric.value, DEFAULT_STATE_META)
             instance_rows.append(
                 ft.Row(
                     controls=[
@@ -254,7 +385,7 @@ class AzureVMMonitor(BaseMonitor):
                             ],
                             spacing=2,
                         ),
-                        padding=ft.Padding.symmetric(vertical=10),
+                        padding=KPI_PADDING,
                     ),
                     *instance_rows,
                     *(
@@ -272,8 +403,8 @@ class AzureVMMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
-            border=ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.BLUE)),
+            bgcolor=CARD_BGCOLOR,
+            border=CARD_BORDER,
         )
 
     def _render_error_card(self, data: MonitorResult) -> ft.Control:
@@ -298,10 +429,9 @@ class AzureVMMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.RED),
+            bgcolor=ERROR_CARD_BGCOLOR,
         )
 
     def _shorten_vm_size(self, size: str) -> str:
-        if size.startswith("Standard_"):
-            return size.replace("Standard_", "")
+        size = size.removeprefix("Standard_")
         return size[:15] + "..." if len(size) > 15 else size
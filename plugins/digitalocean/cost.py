@@ -4,16 +4,25 @@ DigitalOcean Billing 费用监控插件
 使用 DigitalOcean REST API 获取账户余额和账单信息。
 """
 
+import asyncio
+from functools import lru_cache
+
 import flet as ft
 import httpx
 
+from core.http_client import get_http_client
 from core.models import MetricData, MonitorResult
 from core.plugin_mgr import register_plugin
-from core.thread_utils import run_blocking
 from plugins.interface import BaseMonitor
+from ui.components.card import CARD_BGCOLOR, ERROR_CARD_BGCOLOR, KPI_PADDING, STATUS_COLORS
 
 # DigitalOcean API 基础 URL
 DO_API_BASE = "https://api.digitalocean.com/v2"
+# 卡片中展示的最近账单记录数，同时作为 billing_history 的分页大小，避免下载用不到的记录
+MAX_BILLING_RECORDS = 3
+
+# 卡片边框使用DigitalOcean 蓝色
+CARD_BORDER = ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.BLUE))
 
 
 @register_plugin("digitalocean_cost")
@@ -24,6 +33,9 @@ class DigitalOceanCostMonitor(BaseMonitor):
     监控 DigitalOcean 账户的余额和账单信息。
     """
 
+    # 费用数据变化缓慢，连续未变化时逐步降低自动刷新频率
+    ADAPTIVE_POLLING: bool = True
+
     @property
     def plugin_id(self) -> str:
         return "digitalocean_cost"
@@ -58,54 +70,48 @@ class DigitalOceanCostMonitor(BaseMonitor):
             return self._create_error_result("未配置 DigitalOcean API Token")
 
         try:
-            result = await run_blocking(
-                self._fetch_billing_sync,
-                api_token,
-            )
-            return result
+            return await self._fetch_billing(api_token)
         except Exception as e:
             return self._create_error_result(f"获取账单失败: {e!s}")
 
-    def _fetch_billing_sync(
-        self,
-        api_token: str,
-    ) -> MonitorResult:
-        """同步获取账单数据（在线程池中执行）"""
-        headers = {
-            "Authorization": f"Bearer {api_token}",
-            "Content-Type": "application/json",
-        }
+    async def _fetch_billing(self, api_token: str) -> MonitorResult:
+        """获取账单数据（复用全局 HTTP 客户端的连接池）"""
+        client = get_http_client()
+        headers = {"Authorization": f"Bearer {api_token}"}
 
         try:
-            with httpx.Client(timeout=30) as client:
-                # 获取账户余额
-                balance_response = client.get(
-                    f"{DO_API_BASE}/customers/my/balance",
-                    headers=headers,
-                )
-
-                if balance_response.status_code == 401:
-                    return self._create_error_result("API Token 无效")
-                elif balance_response.status_code == 403:
-                    return self._create_error_result("API Token 无权限访问账单")
-                elif balance_response.status_code != 200:
-                    return self._create_error_result(
-                        f"API 错误: {balance_response.status_code}"
-                    )
-
-                balance_data = balance_response.json()
-
-                # 获取账单历史（最近的账单）
-                billing_response = client.get(
+            # 账户余额与账单历史（最近的账单）相互独立，并发请求
+            balance_response, billing_response = await asyncio.gather(
+                client.get(f"{DO_API_BASE}/customers/my/balance", headers=headers),
+                client.get(
                     f"{DO_API_BASE}/customers/my/billing_history",
                     headers=headers,
-                    params={"per_page": 5},
+                    params={"per_page": MAX_BILLING_RECORDS},
+                ),
+                return_exceptions=True,
+            )
+            if isinstance(balance_response, BaseException):
+                raise balance_response
+
+            if balance_response.status_code == 401:
+                return self._create_error_result("API Token 无效")
+            elif balance_response.status_code == 403:
+                return self._create_error_result("API Token 无权限访问账单")
+            elif balance_response.status_code != 200:
+                return self._create_error_result(
+                    f"API 错误: {balance_response.status_code}"
                 )
 
-                billing_history = []
-                if billing_response.status_code == 200:
-                    billing_data = billing_response.json()
-                    billing_history = billing_data.get("billing_history", [])
+            balance_data = balance_response.json()
+
+            billing_history = []
+            # 账单历史为可选信息，获取失败时仅展示余额
+            if (
+                not isinstance(billing_response, BaseException)
+                and billing_response.status_code == 200
+            ):
+                billing_data = billing_response.json()
+                billing_history = billing_data.get("billing_history", [])
 
             return self._parse_billing_response(balance_data, billing_history)
 
@@ -160,57 +166,49 @@ class DigitalOceanCostMonitor(BaseMonitor):
                 unit="USD",
                 status="normal",
             ),
+            # 最近账单记录
+            *(
+                self._billing_record_metric(record)
+                for record in billing_history[:MAX_BILLING_RECORDS]
+            ),
         ]
 
-        # 添加最近账单记录
-        for record in billing_history[:3]:
-            description = record.get("description", "未知")
-            amount = float(record.get("amount", "0"))
-            record_type = record.get("type", "")
-
-            # 缩短描述
-            if len(description) > 25:
-                description = description[:22] + "..."
-
-            if record_type == "Payment":
-                value_str = f"+${abs(amount):.2f}"
-            else:
-                value_str = f"-${abs(amount):.2f}"
-
-            metrics.append(
-                MetricData(
-                    label=description,
-                    value=value_str,
-                    status="normal",
-                )
-            )
-
         return self._create_success_result(metrics)
 
+    def _billing_record_metric(self, record: dict) -> MetricData:
+        """将单条账单记录转换为指标，付款显示为 +，其余显示为 -"""
+        amount = abs(float(record.get("amount", "0")))
+        sign = "+" if record.get("type", "") == "Payment" else "-"
+        return MetricData(
+            label=self._shorten_description(record.get("description", "未知")),
+            value=f"{sign}${amount:.2f}",
+            status="normal",
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _shorten_description(description: str) -> str:
+        """缩短账单描述（最近账单在每次刷新中重复出现，缓存截断结果）"""
+        return description[:22] + "..." if len(description) > 25 else description
+
     def render_card(self, data: MonitorResult) -> ft.Control:
         """渲染 DigitalOcean 费用监控卡片"""
-        status_colors = {
-            "normal": ft.Colors.GREEN_400,
-            "warning": ft.Colors.AMBER,
-            "error": ft.Colors.RED,
-        }
-        color = status_colors.get(data.overall_status, ft.Colors.GREY)
+        color = STATUS_COLORS.get(data.overall_status, ft.Colors.GREY)
 
         main_metric = data.metrics[0] if data.metrics else None
         if not main_metric:
             return self._render_error_card(data)
 
-        detail_rows = []
-        for metric in data.metrics[1:6]:
-            detail_rows.append(
-                ft.Row(
-                    controls=[
-                        ft.Text(metric.label, size=11, color=ft.Colors.WHITE_70, expand=True),
-                        ft.Text(metric.value, size=11, color=ft.Colors.WHITE),
-                    ],
-                    spacing=8,
-                )
+        detail_rows = [
+            ft.Row(
+                controls=[
+                    ft.Text(metric.label, size=11, color=ft.Colors.WHITE_70, expand=True),
+                    ft.Text(metric.value, size=11, color=ft.Colors.WHITE),
+                ],
+                spacing=8,
             )
+            for metric in data.metrics[1:6]
+        ]
 
         return ft.Container(
             content=ft.Column(
@@ -242,7 +240,7 @@ class DigitalOceanCostMonitor(BaseMonitor):
                             ],
                             spacing=2,
                         ),
-                        padding=ft.Padding.symmetric(vertical=10),
+                        padding=KPI_PADDING,
                     ),
                     ft.Text("账单详情", size=12, color=ft.Colors.WHITE_54),
                     *detail_rows,
@@ -261,8 +259,8 @@ class DigitalOceanCostMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
-            border=ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.BLUE)),
+            bgcolor=CARD_BGCOLOR,
+            border=CARD_BORDER,
         )
 
     def _render_error_card(self, data: MonitorResult) -> ft.Control:
@@ -288,5 +286,5 @@ class DigitalOceanCostMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.RED),
+            bgcolor=ERROR_CARD_BGCOLOR,
         )
@@ -4,12 +4,63 @@ GCP Cloud Billing Budgets 费用监控插件
 使用 Google Cloud Billing Budgets API 获取预算和支出信息。
 """
 
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 import flet as ft
 
 from core.models import MetricData, MonitorResult
 from core.plugin_mgr import register_plugin
 from core.thread_utils import run_blocking
 from plugins.interface import BaseMonitor
+from ui.components.card import CARD_BGCOLOR, ERROR_CARD_BGCOLOR, KPI_PADDING, STATUS_COLORS
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+# 查询错误 -> 提示信息，按顺序匹配第一个命中的规则
+QUERY_ERROR_MESSAGES: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"not found|\b404\b", re.IGNORECASE), "表 '{table}' 不存在，请检查表名格式"),
+    (
+        re.compile(r"permission|\b403\b", re.IGNORECASE),
+        "权限不足：请为服务账号添加 BigQuery Data Viewer 角色",
+    ),
+    (re.compile(r"access denied", re.IGNORECASE), "访问被拒绝：请检查服务账号权限"),
+)
+# 限流/配额错误的特征。BigQuery 以 HTTP 403 返回 rateLimitExceeded、quotaExceeded，
+# 需在匹配权限规则之前排除，这类错误稍后即可恢复，不作为配置错误缓存
+RATE_LIMIT_PATTERN = re.compile(
+    r"ratelimitexceeded|quotaexceeded|rate limit|quota exceeded|\b429\b", re.IGNORECASE
+)
+# 查询扫描量超过 maximum_bytes_billed 的错误特征
+BYTES_BILLED_PATTERN = re.compile(r"bytes billed|bytesbilledlimitexceeded", re.IGNORECASE)
+# 客户端/凭据错误 -> 提示信息
+CLIENT_ERROR_MESSAGES: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"permission|forbidden", re.IGNORECASE), "需要 BigQuery Data Viewer 权限"),
+    (re.compile(r"authentication|credential", re.IGNORECASE), "GCP 凭据无效"),
+)
+
+# 服务账号 JSON 摘要 -> BigQuery 客户端，在所有 GCP 插件实例之间共享，
+# 避免每次刷新重新解析密钥并建立连接。按最近使用顺序保存，超出上限时关闭最久未用的客户端
+_client_cache: OrderedDict[str, "bigquery.Client"] = OrderedDict()
+_client_lock = threading.Lock()
+# 缓存的客户端数量上限，防止服务账号频繁变更时旧客户端及其连接池持续累积
+MAX_CACHED_CLIENTS = 8
+
+# BigQuery 导出表全名 project.dataset.table（表名无法参数化，只能校验后拼入 SQL）
+# 兼容域限定项目 ID，如 example.com:my-project
+BIGQUERY_TABLE_PATTERN = re.compile(r"(?:[\w.-]+:)?[\w-]+\.\w+\.[\w-]+")
+
+# 卡片边框使用Google 红色
+CARD_BORDER = ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.RED))
 
 
 @register_plugin("gcp_cost")
@@ -20,6 +71,27 @@ class GCPCostMonitor(BaseMonitor):
     使用 Cloud Billing Budgets API 监控预算和实际支出。
     """
 
+    # 费用数据变化缓慢，连续未变化时逐步降低自动刷新频率
+    ADAPTIVE_POLLING: bool = True
+    # 查询结果缓存有效期（秒）。账单导出表每隔数小时才更新，无需每次刷新都重新计费查询
+    RESULT_TTL: float = 900.0
+    # 配置类错误（凭据无效、权限不足、表不存在）的缓存时间（秒），期间不再重复请求
+    ERROR_BACKOFF: float = 60.0
+    # 获取费用的超时时间（秒）
+    QUERY_TIMEOUT: float = 30.0
+    # 单次查询计费字节上限，None 表示不限制。当月扫描量随导出数据量增长，
+    # 固定上限会让账单较大的账户每次轮询都失败，默认不设上限，可按需在子类或实例上调整
+    MAX_BYTES_BILLED: int | None = None
+
+    def __init__(self, service_id: str, alias: str, credentials: dict[str, str]) -> None:
+        super().__init__(service_id, alias, credentials)
+        # (导出表, 账单月份) -> (缓存时间, 查询结果行)
+        self._result_cache: dict[tuple[str, str], tuple[float, list]] = {}
+        # (缓存时间, 错误结果)，仅缓存重试也无法恢复的配置类错误
+        self._error_cache: tuple[float, MonitorResult] | None = None
+        # 导出表 -> 分区裁剪条件，表的分区方式不会变化，每张表只查询一次元数据
+        self._partition_filters: dict[str, str] = {}
+
     @property
     def plugin_id(self) -> str:
         return "gcp_cost"
@@ -50,8 +122,6 @@ class GCPCostMonitor(BaseMonitor):
         """
         获取 GCP 费用信息（通过 BigQuery 导出）
         """
-        import asyncio
-
         service_account_json = self.credentials.get("service_account_json", "")
         bigquery_table = self.credentials.get("gcp_bigquery_table", "")
 
@@ -61,19 +131,38 @@ class GCPCostMonitor(BaseMonitor):
         if not bigquery_table:
             return self._create_error_result("未配置 BigQuery 费用导出表")
 
+        if not BIGQUERY_TABLE_PATTERN.fullmatch(bigquery_table):
+            return self._create_error_result(
+                "BigQuery 导出表格式无效，应为 project.dataset.table"
+            )
+
+        # 配置类错误在 ERROR_BACKOFF 内直接返回，避免每次刷新都重复触发 403/404
+        if (
+            self._error_cache is not None
+            and time.monotonic() - self._error_cache[0] < self.ERROR_BACKOFF
+        ):
+            return self._error_cache[1]
+
+        # 缓存未过期时直接在事件循环中构建结果，无需切换到线程池
+        current_month = datetime.now().strftime("%Y-%m")
+        cached = self._get_cached_rows(bigquery_table, current_month)
+        if cached is not None:
+            return self._parse_cost_rows(cached)
+
         try:
-            # 添加 30 秒超时
             result = await asyncio.wait_for(
                 run_blocking(
                     self._fetch_cost_from_bigquery,
                     service_account_json,
                     bigquery_table,
                 ),
-                timeout=30.0,
+                timeout=self.QUERY_TIMEOUT,
             )
             return result
         except TimeoutError:
-            return self._create_error_result("请求超时（30秒），请检查网络连接")
+            return self._create_error_result(
+                f"请求超时（{self.QUERY_TIMEOUT:.0f}秒），请检查网络连接"
+            )
         except Exception as e:
             return self._create_error_result(f"获取费用失败: {e!s}")
 
@@ -83,36 +172,25 @@ class GCPCostMonitor(BaseMonitor):
         bigquery_table: str,
     ) -> MonitorResult:
         """从 BigQuery 获取费用数据"""
-        import json
-        from datetime import datetime
-
         try:
-            from google.cloud import bigquery
-            from google.oauth2 import service_account
+            from google.cloud import bigquery  # noqa: F401
         except ImportError:
             return self._create_error_result(
                 "请安装 google-cloud-bigquery 依赖"
             )
 
         try:
-            # 解析服务账号 JSON
-            if service_account_json.startswith("{"):
-                service_account_info = json.loads(service_account_json)
-                credentials = service_account.Credentials.from_service_account_info(
-                    service_account_info,
-                )
-            else:
-                credentials = service_account.Credentials.from_service_account_file(
-                    service_account_json,
-                )
-
-            # 创建 BigQuery 客户端
-            client = bigquery.Client(credentials=credentials)
+            client = self._get_bigquery_client(service_account_json)
 
             # 获取当前月份
             now = datetime.now()
             current_month = now.strftime("%Y-%m")
 
+            try:
+                partition_filter = self._get_partition_filter(client, bigquery_table)
+            except Exception as e:
+                return self._query_error_result(e, bigquery_table)
+
             # 构造查询 - 获取当月费用总计和按服务分类
             # 注意: credits.amount 是负数，表示折扣金额
             # 实际费用 = cost + credits.amount
@@ -130,7 +208,9 @@ class GCPCostMonitor(BaseMonitor):
                         AS total_credits,
                     currency
                 FROM `{bigquery_table}`
-                WHERE invoice.month = '{current_month.replace('-', '')}'
+                WHERE invoice.month = @month
+                    -- 当月账单数据均在月初之后导出，按导出时间过滤以裁剪分区、减少扫描量
+                    AND {partition_filter}
                 GROUP BY service.description, currency
             )
             SELECT
@@ -138,7 +218,10 @@ class GCPCostMonitor(BaseMonitor):
                 gross_cost,
                 total_credits,
                 gross_cost + total_credits AS net_cost,
-                currency
+                currency,
+                -- 窗口聚合在 LIMIT 之前计算，覆盖全部服务而非仅返回的前 10 行
+                SUM(total_credits) OVER () AS month_credits,
+                SUM(gross_cost + total_credits) OVER () AS month_net
             FROM ServiceCosts
             ORDER BY
                 CASE
@@ -155,134 +238,248 @@ class GCPCostMonitor(BaseMonitor):
             """
 
             try:
-                query_job = client.query(query)
-                results = list(query_job.result())
+                results = self._query_cost_rows(client, query, bigquery_table, current_month)
             except Exception as e:
-                error_msg = str(e)
-                error_lower = error_msg.lower()
-
-                if "not found" in error_lower or "404" in error_msg:
-                    return self._create_error_result(
-                        f"表 '{bigquery_table}' 不存在，请检查表名格式"
-                    )
-                elif "permission" in error_lower or "403" in error_msg:
-                    return self._create_error_result(
-                        "权限不足：请为服务账号添加 BigQuery Data Viewer 角色"
-                    )
-                elif "access denied" in error_lower:
-                    return self._create_error_result(
-                        "访问被拒绝：请检查服务账号权限"
-                    )
-                return self._create_error_result(f"BigQuery 错误: {error_msg}")
-
-            if not results:
-                return self._create_success_result(
-                    [
-                        MetricData(
-                            label="本月费用",
-                            value="$0.00",
-                            status="normal",
-                        ),
-                        MetricData(
-                            label="提示",
-                            value="本月暂无费用数据",
-                            status="normal",
-                        ),
-                    ]
+                return self._query_error_result(e, bigquery_table)
+
+            return self._parse_cost_rows(results)
+
+        except json.JSONDecodeError:
+            return self._create_config_error("服务账号 JSON 格式无效")
+        except FileNotFoundError:
+            return self._create_config_error("服务账号文件不存在")
+        except Exception as e:
+            if RATE_LIMIT_PATTERN.search(str(e)):
+                return self._create_rate_limit_error(e)
+            message = self._match_error(str(e), CLIENT_ERROR_MESSAGES)
+            if message is not None:
+                return self._create_config_error(message)
+            return self._create_error_result(f"GCP 错误: {e!s}")
+
+    def _get_partition_filter(self, client: "bigquery.Client", bigquery_table: str) -> str:
+        """
+        返回当月数据的分区裁剪条件
+
+        标准账单导出表按导入时间分区，只有过滤 _PARTITIONTIME 伪列才能裁剪分区；
+        视图、复制表或按列分区的表没有该伪列，只按 export_time 过滤。
+
+        Args:
+            client: BigQuery 客户端
+            bigquery_table: 导出表全名
+
+        Returns:
+            str: 拼入 WHERE 子句的过滤条件
+        """
+        partition_filter = self._partition_filters.get(bigquery_table)
+        if partition_filter is None:
+            partitioning = client.get_table(bigquery_table).time_partitioning
+            partition_filter = "export_time >= TIMESTAMP(PARSE_DATE('%Y%m', @month))"
+            if partitioning is not None and partitioning.field is None:
+                partition_filter = (
+                    "_PARTITIONTIME >= TIMESTAMP(PARSE_DATE('%Y%m', @month)) AND "
+                    + partition_filter
                 )
+            self._partition_filters[bigquery_table] = partition_filter
+        return partition_filter
 
-            # 计算总费用（原价、折扣、实际）
-            sum(row.gross_cost for row in results)
-            total_credits = sum(row.total_credits for row in results)
-            total_net = sum(row.net_cost for row in results)
-            currency = results[0].currency if results else "USD"
-
-            # 构建指标
-            metrics = [
-                MetricData(
-                    label="本月费用",
-                    value=f"${total_net:.2f}" if total_net >= 0 else f"-${abs(total_net):.2f}",
-                    unit=currency,
-                    status=(
-                        "normal" if total_net < 100
-                        else ("warning" if total_net < 500 else "error")
-                    ),
-                    trend="up" if total_net > 0 else "flat",
-                ),
-            ]
+    def _query_error_result(self, error: Exception, bigquery_table: str) -> MonitorResult:
+        """将查询阶段的异常映射为错误结果，配置类错误会被缓存"""
+        if self.MAX_BYTES_BILLED is not None and BYTES_BILLED_PATTERN.search(str(error)):
+            # 扫描量随导出数据增长而变化，并非配置错误，不缓存，下次刷新仍会重试
+            return self._create_error_result(
+                f"查询扫描量超过上限 ({self.MAX_BYTES_BILLED / 1024**3:.0f} GiB)，"
+                "请确认导出表已按时间分区"
+            )
+        if RATE_LIMIT_PATTERN.search(str(error)):
+            return self._create_rate_limit_error(error)
+        message = self._match_error(str(error), QUERY_ERROR_MESSAGES)
+        if message is not None:
+            return self._create_config_error(message.format(table=bigquery_table))
+        return self._create_error_result(f"BigQuery 错误: {error!s}")
+
+    def _create_rate_limit_error(self, error: Exception) -> MonitorResult:
+        """创建限流/配额错误结果，不缓存，下次刷新直接重试"""
+        return self._create_error_result(f"BigQuery 请求受限（限流或配额），稍后重试: {error!s}")
+
+    def _create_config_error(self, error_message: str) -> MonitorResult:
+        """创建配置类错误结果，并在 ERROR_BACKOFF 内缓存"""
+        result = self._create_error_result(error_message)
+        self._error_cache = (time.monotonic(), result)
+        return result
+
+    @staticmethod
+    def _match_error(
+        error_msg: str,
+        rules: tuple[tuple[re.Pattern[str], str], ...],
+    ) -> str | None:
+        """返回第一个匹配错误信息的规则对应的提示，均不匹配时返回 None"""
+        return next((message for pattern, message in rules if pattern.search(error_msg)), None)
+
+    def _get_bigquery_client(self, service_account_json: str) -> "bigquery.Client":
+        """
+        获取 BigQuery 客户端
 
-            # 如果有折扣，显示折扣信息
-            if total_credits < 0:
-                metrics.append(
-                    MetricData(
-                        label="折扣优惠",
-                        value=f"-${abs(total_credits):.2f}",
-                        status="normal",
-                    )
+        按服务账号 JSON 的摘要缓存客户端，使用相同服务账号的插件实例共享同一客户端
+        （及其连接和访问令牌）。服务账号凭据会在令牌过期前自动刷新。缓存最多保留
+        MAX_CACHED_CLIENTS 个客户端，超出时关闭最久未使用的客户端。可在线程池中并发调用。
+
+        Args:
+            service_account_json: 服务账号 JSON 内容或文件路径
+
+        Returns:
+            bigquery.Client: BigQuery 客户端
+        """
+        from google.cloud import bigquery
+        from google.oauth2 import service_account
+
+        key = hashlib.sha256(service_account_json.encode()).hexdigest()
+        with _client_lock:
+            client = _client_cache.get(key)
+            if client is not None:
+                _client_cache.move_to_end(key)
+                return client
+
+            # 解析服务账号 JSON
+            if service_account_json.startswith("{"):
+                service_account_info = json.loads(service_account_json)
+                credentials = service_account.Credentials.from_service_account_info(
+                    service_account_info,
                 )
+            else:
+                credentials = service_account.Credentials.from_service_account_file(
+                    service_account_json,
+                )
+
+            client = bigquery.Client(credentials=credentials, project=credentials.project_id)
+            _client_cache[key] = client
+            while len(_client_cache) > MAX_CACHED_CLIENTS:
+                _, evicted = _client_cache.popitem(last=False)
+                evicted.close()
+            return client
 
-            # 添加服务明细（最多 4 个）- 显示原价
-            for row in results[:4]:
-                service_name = self._shorten_name(row.service_name or "未知服务")
-                # 显示原价（gross_cost），让用户了解各服务实际消费
-                cost_value = row.gross_cost
-                metrics.append(
+    def _query_cost_rows(
+        self,
+        client: "bigquery.Client",
+        query: str,
+        bigquery_table: str,
+        current_month: str,
+    ) -> list:
+        """执行费用查询，在 RESULT_TTL 内复用同一导出表、同一月份的上次结果"""
+        from google.cloud import bigquery
+
+        cached = self._get_cached_rows(bigquery_table, current_month)
+        if cached is not None:
+            return cached
+
+        # 月份作为查询参数传入，使查询文本保持不变；
+        # 同时启用 BigQuery 服务端的查询结果缓存（24 小时内相同查询不重复计费）
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("month", "STRING", current_month.replace("-", "")),
+            ],
+            use_query_cache=True,
+            maximum_bytes_billed=self.MAX_BYTES_BILLED,
+            # 超时后结果会被丢弃，让 BigQuery 在服务端同时终止作业，避免继续占用计费槽位
+            job_timeout_ms=int(self.QUERY_TIMEOUT * 1000),
+        )
+        query_job = client.query(query, job_config=job_config)
+        try:
+            rows = list(query_job.result(timeout=self.QUERY_TIMEOUT))
+        except TimeoutError:
+            query_job.cancel()
+            raise
+        self._result_cache = {(bigquery_table, current_month): (time.monotonic(), rows)}
+        return rows
+
+    def _get_cached_rows(self, bigquery_table: str, current_month: str) -> list | None:
+        """返回 RESULT_TTL 内缓存的查询结果，过期或不存在时返回 None"""
+        cached = self._result_cache.get((bigquery_table, current_month))
+        if cached is not None and time.monotonic() - cached[0] < self.RESULT_TTL:
+            return cached[1]
+        return None
+
+    def _parse_cost_rows(self, results: list) -> MonitorResult:
+        """将费用查询结果行转换为监控结果"""
+        if not results:
+            return self._create_success_result(
+                [
                     MetricData(
-                        label=service_name,
-                        value=(
-                            f"${cost_value:.2f}" if cost_value >= 0
-                            else f"-${abs(cost_value):.2f}"
-                        ),
+                        label="本月费用",
+                        value="$0.00",
                         status="normal",
-                    )
-                )
-
-            return self._create_success_result(metrics)
+                    ),
+                    MetricData(
+                        label="提示",
+                        value="本月暂无费用数据",
+                        status="normal",
+                    ),
+                ]
+            )
 
-        except json.JSONDecodeError:
-            return self._create_error_result("服务账号 JSON 格式无效")
-        except FileNotFoundError:
-            return self._create_error_result("服务账号文件不存在")
-        except Exception as e:
-            error_str = str(e).lower()
-            if "permission" in error_str or "forbidden" in error_str:
-                return self._create_error_result("需要 BigQuery Data Viewer 权限")
-            elif "authentication" in error_str or "credential" in error_str:
-                return self._create_error_result("GCP 凭据无效")
-            return self._create_error_result(f"GCP 错误: {e!s}")
+        # 当月总折扣与实际费用由查询直接给出，每行相同
+        total_credits = results[0].month_credits
+        total_net = results[0].month_net
+        currency = results[0].currency
+
+        # 构建指标：本月费用、折扣（如有）、服务明细（最多 4 个）
+        metrics = [
+            MetricData(
+                label="本月费用",
+                value=f"${total_net:.2f}" if total_net >= 0 else f"-${abs(total_net):.2f}",
+                unit=currency,
+                status=(
+                    "normal" if total_net < 100
+                    else ("warning" if total_net < 500 else "error")
+                ),
+                trend="up" if total_net > 0 else "flat",
+            ),
+            *(
+                [MetricData(label="折扣优惠", value=f"-${abs(total_credits):.2f}", status="normal")]
+                if total_credits < 0
+                else []
+            ),
+            *(self._service_metric(row) for row in results[:4]),
+        ]
+
+        return self._create_success_result(metrics)
+
+    def _service_metric(self, row: "bigquery.Row") -> MetricData:
+        """将单个服务的费用行转换为指标，显示原价（gross_cost），让用户了解各服务实际消费"""
+        cost_value = row.gross_cost
+        return MetricData(
+            label=self._shorten_name(row.service_name or "未知服务"),
+            value=f"${cost_value:.2f}" if cost_value >= 0 else f"-${abs(cost_value):.2f}",
+            status="normal",
+        )
 
-    def _shorten_name(self, name: str) -> str:
-        """缩短名称"""
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _shorten_name(name: str) -> str:
+        """缩短名称（服务名在每次刷新中重复出现，缓存截断结果）"""
         return name[:20] + "..." if len(name) > 20 else name
 
     def render_card(self, data: MonitorResult) -> ft.Control:
         """渲染 GCP 费用监控卡片"""
-        status_colors = {
-            "normal": ft.Colors.GREEN_400,
-            "warning": ft.Colors.AMBER,
-            "error": ft.Colors.RED,
-        }
-        color = status_colors.get(data.overall_status, ft.Colors.GREY)
+        color = STATUS_COLORS.get(data.overall_status, ft.Colors.GREY)
 
         main_metric = data.metrics[0] if data.metrics else None
         if not main_metric:
             return self._render_error_card(data)
 
-        detail_rows = []
-        for metric in data.metrics[1:6]:
-            detail_rows.append(
-                ft.Row(
-                    controls=[
-                        ft.Text(metric.label, size=11, color=ft.Colors.WHITE_70, expand=True),
-                        ft.Text(
-                            f"{metric.value} {metric.unit or ''}".strip(),
-                            size=11,
-                            color=ft.Colors.WHITE,
-                        ),
-                    ],
-                    spacing=8,
-                )
+        detail_rows = [
+            ft.Row(
+                controls=[
+                    ft.Text(metric.label, size=11, color=ft.Colors.WHITE_70, expand=True),
+                    ft.Text(
+                        f"{metric.value} {metric.unit}" if metric.unit else metric.value,
+                        size=11,
+                        color=ft.Colors.WHITE,
+                    ),
+                ],
+                spacing=8,
             )
+            for metric in data.metrics[1:6]
+        ]
 
         return ft.Container(
             content=ft.Column(
@@ -327,7 +524,7 @@ class GCPCostMonitor(BaseMonitor):
                             ],
                             spacing=2,
                         ),
-                        padding=ft.Padding.symmetric(vertical=10),
+                        padding=KPI_PADDING,
                     ),
                     ft.Text("预算详情", size=12, color=ft.Colors.WHITE_54),
                     *detail_rows,
@@ -346,8 +543,8 @@ class GCPCostMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
-            border=ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.RED)),
+            bgcolor=CARD_BGCOLOR,
+            border=CARD_BORDER,
         )
 
     def _render_error_card(self, data: MonitorResult) -> ft.Control:
@@ -375,5 +572,5 @@ class GCPCostMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.RED),
+            bgcolor=ERROR_CARD_BGCOLOR,
         )
@@ -4,13 +4,40 @@ Google Gemini API 配额监控插件
 使用 Google GenAI SDK 监控 API 配额和使用情况。
 """
 
+import re
+from functools import lru_cache
+
 import flet as ft
+import httpx
 from google import genai
+from google.genai import types
 from google.genai.errors import ClientError
 
 from core.models import MetricData, MonitorResult
 from core.plugin_mgr import register_plugin
 from plugins.interface import BaseMonitor
+from ui.components.card import CARD_BGCOLOR, ERROR_CARD_BGCOLOR, KPI_PADDING, STATUS_COLORS
+
+# genai 客户端 HTTP 选项：请求超时（毫秒）与异步连接池上限，
+# 避免请求无限挂起或在长时间轮询中累积空闲连接
+HTTP_OPTIONS = types.HttpOptions(
+    timeout=30_000,
+    async_client_args={
+        "limits": httpx.Limits(max_connections=10, max_keepalive_connections=5),
+    },
+)
+
+# 卡片中展示详情的模型数量上限
+MAX_MODEL_DETAILS = 4
+
+# 用于文本生成的模型需支持的方法
+GENERATE_CONTENT_METHOD = "generateContent"
+
+# API Key 无效或无权限的错误特征
+INVALID_KEY_PATTERN = re.compile(r"API_KEY|PERMISSION", re.IGNORECASE)
+
+# 卡片边框使用Gemini 紫色
+CARD_BORDER = ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.PURPLE))
 
 
 @register_plugin("gemini_quota")
@@ -21,6 +48,11 @@ class GeminiQuotaMonitor(BaseMonitor):
     监控 Google Gemini API 的使用情况和可用性。
     """
 
+    def __init__(self, service_id: str, alias: str, credentials: dict[str, str]) -> None:
+        super().__init__(service_id, alias, credentials)
+        # (API Key, 客户端)，跨轮询复用底层 HTTP 连接池
+        self._client: tuple[str, genai.Client] | None = None
+
     @property
     def plugin_id(self) -> str:
         return "gemini_quota"
@@ -57,77 +89,67 @@ class GeminiQuotaMonitor(BaseMonitor):
             return self._create_error_result("未配置 Gemini API Key")
 
         try:
-            # 创建客户端 (google-genai 支持原生异步)
-            client = genai.Client(api_key=api_key)
-
-            # 获取可用模型列表
-            models_response = client.models.list()
-            models = list(models_response)
-
-            # 筛选出支持 generateContent 的模型
-            available_models = []
-            for model in models:
-                supported_methods = getattr(model, "supported_generation_methods", [])
-                if supported_methods and "generateContent" in supported_methods:
-                    available_models.append(
-                        {
-                            "name": model.name.replace("models/", "") if model.name else "",
-                            "display_name": getattr(model, "display_name", model.name),
-                            "input_token_limit": getattr(model, "input_token_limit", 0),
-                            "output_token_limit": getattr(model, "output_token_limit", 0),
-                        }
-                    )
-
-            # 构建指标
+            client = self._get_client(api_key)
+
+            # 流式遍历模型列表，只计数并保留前 MAX_MODEL_DETAILS 个支持 generateContent 的模型
+            model_count = 0
+            available_count = 0
+            model_metrics: list[MetricData] = []
+            # 使用异步子客户端，列出模型期间不阻塞 UI 事件循环
+            async for model in await client.aio.models.list():
+                model_count += 1
+                supported_methods = getattr(model, "supported_generation_methods", None)
+                if supported_methods and GENERATE_CONTENT_METHOD in supported_methods:
+                    available_count += 1
+                    if available_count <= MAX_MODEL_DETAILS:
+                        model_metrics.append(self._model_metric(model))
+
             metrics = [
                 MetricData(
                     label="可用模型",
-                    value=str(len(available_models)),
+                    value=str(available_count),
                     unit="个",
-                    status="normal" if available_models else "warning",
-                )
-            ]
-
-            # 添加 API 状态
-            metrics.append(
+                    status="normal" if available_count else "warning",
+                ),
                 MetricData(
                     label="API 状态",
-                    value="正常" if models else "无响应",
-                    status="normal" if models else "error",
-                )
-            )
-
-            # 添加模型详情
-            for model_info in available_models[:4]:
-                input_str = self._format_tokens(model_info["input_token_limit"])
-                output_str = self._format_tokens(model_info["output_token_limit"])
-                metrics.append(
-                    MetricData(
-                        label=self._shorten_model_name(model_info["name"]),
-                        value=f"{input_str}/{output_str}",
-                        status="normal",
-                    )
-                )
+                    value="正常" if model_count else "无响应",
+                    status="normal" if model_count else "error",
+                ),
+                *model_metrics,
+            ]
 
             return self._create_success_result(metrics)
 
         except ClientError as e:
             error_msg = str(e)
-            if "API_KEY" in error_msg.upper() or "PERMISSION" in error_msg.upper():
+            if INVALID_KEY_PATTERN.search(error_msg):
                 return self._create_error_result("API Key 无效或已过期")
             return self._create_error_result(f"API 错误: {error_msg}")
 
         except Exception as e:
             return self._create_error_result(f"未知错误: {e!s}")
 
+    def _get_client(self, api_key: str) -> genai.Client:
+        """获取 genai 客户端，API Key 不变时复用，避免每次轮询重新建立 TLS 连接"""
+        if self._client is None or self._client[0] != api_key:
+            self._client = (api_key, genai.Client(api_key=api_key, http_options=HTTP_OPTIONS))
+        return self._client[1]
+
+    def _model_metric(self, model: "types.Model") -> MetricData:
+        """构建单个模型的输入/输出 token 限制指标"""
+        name = model.name.removeprefix("models/") if model.name else ""
+        input_str = self._format_tokens(getattr(model, "input_token_limit", 0))
+        output_str = self._format_tokens(getattr(model, "output_token_limit", 0))
+        return MetricData(
+            label=self._shorten_model_name(name),
+            value=f"{input_str}/{output_str}",
+            status="normal",
+        )
+
     def render_card(self, data: MonitorResult) -> ft.Control:
         """渲染 Gemini API 监控卡片"""
-        status_colors = {
-            "normal": ft.Colors.GREEN_400,
-            "warning": ft.Colors.AMBER,
-            "error": ft.Colors.RED,
-        }
-        color = status_colors.get(data.overall_status, ft.Colors.GREY)
+        color = STATUS_COLORS.get(data.overall_status, ft.Colors.GREY)
 
         main_metric = data.metrics[0] if data.metrics else None
         if not main_metric:
@@ -195,7 +217,7 @@ class GeminiQuotaMonitor(BaseMonitor):
                             ],
                             spacing=2,
                         ),
-                        padding=ft.Padding.symmetric(vertical=10),
+                        padding=KPI_PADDING,
                     ),
                     ft.Text("可用模型 (输入/输出限制)", size=12, color=ft.Colors.WHITE_54),
                     *model_rows,
@@ -214,8 +236,8 @@ class GeminiQuotaMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
-            border=ft.Border.all(1, ft.Colors.with_opacity(0.2, ft.Colors.PURPLE)),
+            bgcolor=CARD_BGCOLOR,
+            border=CARD_BORDER,
         )
 
     def _render_error_card(self, data: MonitorResult) -> ft.Control:
@@ -240,10 +262,13 @@ class GeminiQuotaMonitor(BaseMonitor):
             ),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.RED),
+            bgcolor=ERROR_CARD_BGCOLOR,
         )
 
-    def _shorten_model_name(self, name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _shorten_model_name(name: str) -> str:
+        """缩短模型名称（模型名在每次刷新中重复出现，缓存结果）"""
         prefixes = ["gemini-", "models/"]
         result = name
         for prefix in prefixes:
@@ -251,7 +276,10 @@ class GeminiQuotaMonitor(BaseMonitor):
                 result = result[len(prefix) :]
         return result[:20] + "..." if len(result) > 20 else result
 
-    def _format_tokens(self, count: int) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _format_tokens(count: int) -> str:
+        """格式化 token 数量（取值只有少数几种 token 限制，缓存结果）"""
         if count >= 1_000_000:
             return f"{count // 1_000_000}M"
         elif count >= 1_000:
@@ -4,6 +4,8 @@
 定义所有监控插件必须实现的抽象基类 BaseMonitor。
 """
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
@@ -43,6 +45,13 @@ class BaseMonitor(ABC):
     - 插件不再直接返回 UI 控件数据，而是返回标准数据对象
     """
 
+    # 是否启用自动刷新退避：仅适合变化缓慢的数据（如费用），状态类监控保持固定间隔
+    ADAPTIVE_POLLING: bool = False
+    # 自动刷新退避上限（秒）：数据连续未变化时轮询间隔逐次翻倍，最长不超过该值
+    MAX_POLL_INTERVAL: float = 3600.0
+    # 刷新结果的复用时间（秒）：该时间内重复刷新（如连续点击刷新）直接返回上次成功结果
+    REFRESH_TTL: float = 5.0
+
     def __init__(self, service_id: str, alias: str, credentials: dict[str, str]) -> None:
         """
         初始化监控插件
@@ -57,6 +66,12 @@ class BaseMonitor(ABC):
         self.credentials = credentials
         self._enabled = True
         self._last_result: MonitorResult | None = None
+        # 进行中的 fetch_data 任务，重叠的刷新请求共享同一次获取
+        self._inflight: asyncio.Task[MonitorResult] | None = None
+        # 自适应轮询：上次获取完成时间、指标摘要及连续未变化次数
+        self._last_fetched_at: float | None = None
+        self._last_metrics_key: int | None = None
+        self._unchanged_count = 0
 
     @property
     @abstractmethod
@@ -147,11 +162,80 @@ class BaseMonitor(ABC):
         """
         刷新数据并缓存结果
 
+        上一次刷新尚未完成时（如自动刷新期间手动点击刷新），直接等待进行中的
+        获取结果，不会重复请求后端；上次成功获取距今不足 REFRESH_TTL 时直接返回
+        上次结果。
+
         Returns:
             MonitorResult: 最新的监控结果
         """
-        self._last_result = await self.fetch_data()
-        return self._last_result
+        if self._inflight is None or self._inflight.done():
+            if self._is_last_result_fresh():
+                return self._last_result
+            self._inflight = asyncio.create_task(self._fetch_and_track())
+        # shield: 某个调用方被取消时不影响其他等待同一任务的调用方
+        return await asyncio.shield(self._inflight)
+
+    async def _fetch_and_track(self) -> MonitorResult:
+        """
+        获取数据并记录结果，同时记录指标是否与上次相同，用于自适应轮询
+
+        结果在任务内部记录，即使等待的调用方已被取消，后续刷新也能复用本次结果。
+        """
+        result = await self.fetch_data()
+
+        metrics_key = hash(tuple((m.label, m.value, m.status) for m in result.metrics))
+        if result.raw_error is None and metrics_key == self._last_metrics_key:
+            self._unchanged_count += 1
+        else:
+            self._unchanged_count = 0
+        self._last_metrics_key = metrics_key
+        self._last_result = result
+        self._last_fetched_at = time.monotonic()
+        return result
+
+    def _is_last_result_fresh(self) -> bool:
+        """上次结果获取成功且未超过 REFRESH_TTL"""
+        return (
+            self._last_result is not None
+            and self._last_result.raw_error is None
+            and self._last_fetched_at is not None
+            and time.monotonic() - self._last_fetched_at < self.REFRESH_TTL
+        )
+
+    def next_poll_delay(self, base_interval: float) -> float:
+        """
+        计算自动刷新的下一次轮询间隔
+
+        启用 ADAPTIVE_POLLING 时，数据每连续一次未变化，间隔翻倍（最长 MAX_POLL_INTERVAL）；
+        数据变化或出错时恢复为基础间隔。未启用时始终使用基础间隔。
+
+        Args:
+            base_interval: 用户设置的自动刷新间隔（秒）
+
+        Returns:
+            float: 本服务的轮询间隔（秒）
+        """
+        if not self.ADAPTIVE_POLLING:
+            return base_interval
+        delay = base_interval * 2 ** min(self._unchanged_count, 16)
+        return min(delay, max(base_interval, self.MAX_POLL_INTERVAL))
+
+    def is_poll_due(self, base_interval: float) -> bool:
+        """
+        判断自动刷新时是否需要轮询本服务
+
+        Args:
+            base_interval: 用户设置的自动刷新间隔（秒）
+
+        Returns:
+            bool: 距上次获取已超过 next_poll_delay 时返回 True
+        """
+        if self._last_fetched_at is None:
+            return True
+        # 预留 1 秒余量，避免与刷新循环的 sleep 抖动错开一个周期
+        elapsed = time.monotonic() - self._last_fetched_at + 1.0
+        return elapsed >= self.next_poll_delay(base_interval)
 
     def validate_credentials(self) -> bool:
         """
@@ -4,7 +4,6 @@ pytest 配置文件
 提供测试 fixtures 和共享配置。
 """
 
-import tempfile
 from collections.abc import Generator
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -16,14 +15,9 @@ from core.security import SecurityManager
 
 
 @pytest.fixture
-def temp_db_path() -> Generator[Path]:
-    """创建临时数据库路径"""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        path = Path(f.name)
-    yield path
-    # 清理
-    if path.exists():
-        path.unlink()
+def temp_db_path(tmp_path: Path) -> Path:
+    """创建临时数据库路径（由 pytest 的 tmp_path 统一清理）"""
+    return tmp_path / "test.db"
 
 
 @pytest.fixture
@@ -2,12 +2,13 @@
 Azure 插件单元测试
 """
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
-from azure.core.exceptions import ClientAuthenticationError
+from azure.core.exceptions import ClientAuthenticationError, ResourceNotFoundError
 
 from core.models import MetricData, MonitorResult
+from plugins.azure.auth import _credential_cache, get_credential
 from plugins.azure.cost import AzureCostMonitor
 from plugins.azure.vm import AzureVMMonitor
 
@@ -57,14 +58,124 @@ class TestAzureVMMonitor:
     @pytest.mark.asyncio
     async def test_fetch_data_auth_error(self, monitor: AzureVMMonitor) -> None:
         """测试认证失败"""
-        with patch(
-            "plugins.azure.vm.AzureVMMonitor._fetch_vms_sync"
-        ) as mock_fetch:
-            mock_fetch.side_effect = ClientAuthenticationError("Invalid credentials")
-
+        with patch.object(
+            monitor,
+            "_get_vm_inventory",
+            side_effect=ClientAuthenticationError("Invalid credentials"),
+        ):
             result = await monitor.fetch_data()
 
         assert result.overall_status == "error"
+        assert "凭据无效" in (result.raw_error or "")
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_power_states(self, monitor: AzureVMMonitor) -> None:
+        """测试并发查询各 VM 电源状态"""
+        vms = []
+        for i in range(3):
+            vm = MagicMock()
+            vm.id = f"/subscriptions/sub/resourceGroups/RG-{i}/providers/x/vm-{i}"
+            vm.name = f"vm-{i}"
+            vm.location = "eastus"
+            vm.hardware_profile.vm_size = "Standard_B1s"
+            vms.append(vm)
+
+        def power_state(client: object, resource_group: str, vm_name: str) -> str:
+            return "running" if resource_group == "RG-0" else "deallocated"
+
+        with (
+            patch.object(monitor, "_get_vm_inventory", return_value=vms),
+            patch.object(monitor, "_get_power_state", side_effect=power_state),
+        ):
+            result = await monitor.fetch_data()
+
+        assert result.metrics[0].value == "1/3"
+        assert result.metrics[1].value == "2"
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_summary_level(self, monitor: AzureVMMonitor) -> None:
+        """测试 summary 粒度仅通过 statusOnly 列表获取状态"""
+        vms = []
+        for i, state in enumerate(["running", "stopped"]):
+            status = MagicMock()
+            status.code = f"PowerState/{state}"
+            vm = MagicMock()
+            vm.id = f"/subscriptions/sub/resourceGroups/RG-{i}/providers/x/vm-{i}"
+            vm.name = f"vm-{i}"
+            vm.location = "eastus"
+            vm.hardware_profile.vm_size = "Standard_B1s"
+            vm.instance_view.statuses = [status]
+            vms.append(vm)
+
+        monitor.DETAIL_LEVEL = "summary"
+        with (
+            patch.object(monitor, "_list_vm_statuses", return_value=vms),
+            patch.object(monitor, "_get_power_state") as mock_power_state,
+        ):
+            result = await monitor.fetch_data()
+
+        mock_power_state.assert_not_called()
+        assert result.metrics[0].value == "1/2"
+        assert result.metrics[1].value == "1"
+
+    def test_vm_inventory_cached(self, monitor: AzureVMMonitor) -> None:
+        """测试 VM 清单在 TTL 内复用"""
+        mock_client = MagicMock()
+        mock_client.virtual_machines.list_all.return_value = iter([MagicMock()])
+
+        first = monitor._get_vm_inventory(mock_client)
+        second = monitor._get_vm_inventory(mock_client)
+
+        assert first is second
+        assert mock_client.virtual_machines.list_all.call_count == 1
+
+        # TTL 过期后重新获取
+        monitor.INVENTORY_TTL = 0
+        mock_client.virtual_machines.list_all.return_value = iter([])
+        assert monitor._get_vm_inventory(mock_client) == []
+        assert mock_client.virtual_machines.list_all.call_count == 2
+
+    def test_compute_client_reused(self, monitor: AzureVMMonitor) -> None:
+        """测试凭据不变时复用客户端，凭据变化时关闭旧客户端"""
+        with patch("azure.mgmt.compute.ComputeManagementClient") as mock_client_cls:
+            first = monitor._get_compute_client("t", "c", "s", "sub")
+            assert monitor._get_compute_client("t", "c", "s", "sub") is first
+            assert mock_client_cls.call_count == 1
+
+            monitor._get_compute_client("t", "c", "s", "other-sub")
+            first.close.assert_called_once()
+            assert mock_client_cls.call_count == 2
+
+    def test_power_state_error_invalidates_inventory(self, monitor: AzureVMMonitor) -> None:
+        """测试单台 VM 查询失败（如已删除）时丢弃 VM 清单缓存"""
+        mock_client = MagicMock()
+        mock_client.virtual_machines.list_all.return_value = iter([MagicMock()])
+        monitor._get_vm_inventory(mock_client)
+        assert monitor._inventory_cache is not None
+
+        mock_client.virtual_machines.instance_view.side_effect = ResourceNotFoundError("gone")
+        assert monitor._get_power_state(mock_client, "RG-0", "vm-0") == "unknown"
+        assert monitor._inventory_cache is None
+
+    def test_parse_vm_list(self, monitor: AzureVMMonitor) -> None:
+        """测试解析 VM 列表"""
+        states = ["running", "deallocated", "starting"]
+        vms = []
+        for i in range(len(states)):
+            vm = MagicMock()
+            vm.id = f"/subscriptions/sub/resourceGroups/RG-{i}/providers/x/vm-{i}"
+            vm.name = f"vm-{i}"
+            vm.location = "eastus"
+            vm.hardware_profile.vm_size = "Standard_B1s"
+            vms.append(vm)
+
+        result = monitor._parse_vm_list(vms, states)
+
+        assert result.metrics[0].value == "1/3"
+        assert result.metrics[0].status == "warning"  # starting 为过渡状态
+        assert result.metrics[1].value == "1"
+        assert [m.value for m in result.metrics[2:]] == ["running", "deallocated", "starting"]
+        assert result.metrics[2].unit == "B1s"
 
     def test_render_card(self, monitor: AzureVMMonitor) -> None:
         """测试渲染卡片"""
@@ -165,3 +276,31 @@ class TestAzureCostMonitor:
                     "/billingProfiles/PROF456"
                 )
                 assert kwargs["scope"] == expected_scope
+
+
+def test_get_credential_shared() -> None:
+    """测试相同凭据共享同一 Credential 实例"""
+    with patch.dict("plugins.azure.auth._credential_cache", clear=True):
+        first = get_credential("tenant", "client", "secret")
+
+        assert get_credential("tenant", "client", "secret") is first
+        assert get_credential("tenant", "client", "other-secret") is not first
+
+
+def test_get_credential_cache_bounded() -> None:
+    """测试凭据缓存超出上限时关闭最久未使用的凭据，且不以密钥明文作为键"""
+    with (
+        patch.dict("plugins.azure.auth._credential_cache", clear=True),
+        patch("plugins.azure.auth.MAX_CACHED_CREDENTIALS", 2),
+        patch("azure.identity.ClientSecretCredential", side_effect=lambda **_: MagicMock()),
+    ):
+        first = get_credential("tenant", "client", "secret-1")
+        second = get_credential("tenant", "client", "secret-2")
+        # 再次使用 first，使 second 成为最久未使用的凭据
+        get_credential("tenant", "client", "secret-1")
+        get_credential("tenant", "client", "secret-3")
+
+        second.close.assert_called_once()
+        first.close.assert_not_called()
+        assert get_credential("tenant", "client", "secret-1") is first
+        assert not any("secret" in key for key in _credential_cache)
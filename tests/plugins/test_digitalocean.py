@@ -4,6 +4,7 @@ DigitalOcean 插件单元测试
 
 from unittest.mock import patch
 
+import httpx
 import pytest
 
 from core.models import MetricData, MonitorResult
@@ -71,7 +72,7 @@ class TestDigitalOceanCostMonitor:
             ],
         )
 
-        with patch.object(monitor, "_fetch_billing_sync", return_value=mock_result):
+        with patch.object(monitor, "_fetch_billing", return_value=mock_result):
             result = await monitor.fetch_data()
 
         assert result.overall_status == "normal"
@@ -89,7 +90,7 @@ class TestDigitalOceanCostMonitor:
             ],
         )
 
-        with patch.object(monitor, "_fetch_billing_sync", return_value=mock_result):
+        with patch.object(monitor, "_fetch_billing", return_value=mock_result):
             result = await monitor.fetch_data()
 
         assert result.overall_status == "warning"
@@ -104,12 +105,36 @@ class TestDigitalOceanCostMonitor:
             raw_error="API Token 无效",
         )
 
-        with patch.object(monitor, "_fetch_billing_sync", return_value=mock_result):
+        with patch.object(monitor, "_fetch_billing", return_value=mock_result):
             result = await monitor.fetch_data()
 
         assert result.overall_status == "error"
         assert "Token 无效" in (result.raw_error or "")
 
+    @pytest.mark.asyncio
+    async def test_fetch_billing_concurrent(self, monitor: DigitalOceanCostMonitor) -> None:
+        """测试余额与账单历史请求，账单历史失败时仍返回余额"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/balance"):
+                return httpx.Response(
+                    200,
+                    json={
+                        "month_to_date_balance": "12.00",
+                        "account_balance": "0.00",
+                        "month_to_date_usage": "12.00",
+                    },
+                )
+            return httpx.Response(500)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("plugins.digitalocean.cost.get_http_client", return_value=client):
+            result = await monitor._fetch_billing("test-token")
+
+        assert result.overall_status == "normal"
+        assert result.metrics[0].value == "$12.00"
+        assert len(result.metrics) == 3
+
     def test_render_card(self, monitor: DigitalOceanCostMonitor) -> None:
         """测试渲染卡片"""
         data = MonitorResult(
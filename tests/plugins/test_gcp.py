@@ -2,12 +2,15 @@
 GCP 插件单元测试
 """
 
-from unittest.mock import patch
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from core.models import MetricData, MonitorResult
-from plugins.gcp.cost import GCPCostMonitor
+from plugins.gcp.cost import QUERY_ERROR_MESSAGES, GCPCostMonitor
 
 
 class TestGCPCostMonitor:
@@ -193,6 +196,67 @@ class TestGCPCostMonitorBigQuery:
         assert result.overall_status == "error"
         assert "不存在" in (result.raw_error or "") or "错误" in (result.raw_error or "")
 
+    def test_bigquery_client_cached(self, monitor: GCPCostMonitor) -> None:
+        """测试相同服务账号的实例共享 BigQuery 客户端"""
+        sa_json = monitor.credentials["service_account_json"]
+        other = GCPCostMonitor(
+            service_id="test_gcp_cost_2",
+            alias="测试 GCP 2",
+            credentials=dict(monitor.credentials),
+        )
+        with (
+            patch.dict("plugins.gcp.cost._client_cache", clear=True),
+            patch(
+                "google.oauth2.service_account.Credentials.from_service_account_info"
+            ) as mock_creds,
+            patch("google.cloud.bigquery.Client") as mock_client,
+        ):
+            first = monitor._get_bigquery_client(sa_json)
+            second = other._get_bigquery_client(sa_json)
+
+        assert first is second
+        mock_creds.assert_called_once()
+        mock_client.assert_called_once()
+
+    def test_bigquery_client_cache_bounded(self, monitor: GCPCostMonitor) -> None:
+        """测试客户端缓存超出上限时关闭最久未使用的客户端"""
+        with (
+            patch.dict("plugins.gcp.cost._client_cache", clear=True),
+            patch("plugins.gcp.cost.MAX_CACHED_CLIENTS", 2),
+            patch("google.oauth2.service_account.Credentials.from_service_account_info"),
+            patch("google.cloud.bigquery.Client", side_effect=lambda **_: MagicMock()),
+        ):
+            first = monitor._get_bigquery_client('{"id": 1}')
+            second = monitor._get_bigquery_client('{"id": 2}')
+            # 再次使用 first，使 second 成为最久未使用的客户端
+            monitor._get_bigquery_client('{"id": 1}')
+            monitor._get_bigquery_client('{"id": 3}')
+
+            second.close.assert_called_once()
+            first.close.assert_not_called()
+            assert monitor._get_bigquery_client('{"id": 1}') is first
+
+    def test_match_query_error(self, monitor: GCPCostMonitor) -> None:
+        """测试查询错误按规则顺序映射为提示信息"""
+        message = monitor._match_error("404 Not found: Table p:d.t", QUERY_ERROR_MESSAGES)
+        assert message is not None
+        assert "不存在" in message.format(table="p.d.t")
+        denied = monitor._match_error("403 Permission denied", QUERY_ERROR_MESSAGES)
+        assert "权限不足" in (denied or "")
+        assert monitor._match_error("Syntax error", QUERY_ERROR_MESSAGES) is None
+        assert monitor._match_error("Job job_14041 failed", QUERY_ERROR_MESSAGES) is None
+
+    def test_query_result_cached(self, monitor: GCPCostMonitor) -> None:
+        """测试 RESULT_TTL 内相同导出表和月份复用查询结果"""
+        client = MagicMock()
+        client.query.return_value.result.return_value = iter(["row"])
+
+        first = monitor._query_cost_rows(client, "SELECT 1", "p.d.t", "2026-01")
+        second = monitor._query_cost_rows(client, "SELECT 1", "p.d.t", "2026-01")
+
+        assert first == second == ["row"]
+        client.query.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_fetch_data_missing_table(self) -> None:
         """测试缺少 BigQuery 表配置"""
@@ -208,6 +272,117 @@ class TestGCPCostMonitorBigQuery:
         assert result.overall_status == "error"
         assert "未配置" in (result.raw_error or "")
 
+    @pytest.mark.asyncio
+    async def test_fetch_data_cached_rows_skip_thread(self, monitor: GCPCostMonitor) -> None:
+        """测试缓存未过期时不进入线程池"""
+        row = SimpleNamespace(
+            service_name="Compute Engine",
+            gross_cost=120.0,
+            total_credits=-20.0,
+            net_cost=100.0,
+            currency="USD",
+            month_credits=-20.0,
+            month_net=100.0,
+        )
+        current_month = datetime.now().strftime("%Y-%m")
+        table = monitor.credentials["gcp_bigquery_table"]
+        monitor._result_cache = {(table, current_month): (time.monotonic(), [row])}
+
+        with patch("plugins.gcp.cost.run_blocking") as mock_run:
+            result = await monitor.fetch_data()
+
+        mock_run.assert_not_called()
+        assert result.metrics[0].value == "$100.00"
+        assert result.metrics[1].value == "-$20.00"
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_config_error_cached(self, monitor: GCPCostMonitor) -> None:
+        """测试配置类错误在 ERROR_BACKOFF 内不重复查询"""
+        error = monitor._create_config_error("权限不足")
+
+        with patch("plugins.gcp.cost.run_blocking") as mock_run:
+            result = await monitor.fetch_data()
+        mock_run.assert_not_called()
+        assert result is error
+
+        monitor._error_cache = (time.monotonic() - monitor.ERROR_BACKOFF, error)
+        with patch(
+            "plugins.gcp.cost.run_blocking",
+            new_callable=AsyncMock,
+            return_value=monitor._create_error_result("GCP 错误: 网络异常"),
+        ) as mock_run:
+            result = await monitor.fetch_data()
+        mock_run.assert_awaited_once()
+        assert result.raw_error == "GCP 错误: 网络异常"
+
+    def test_bytes_billed_error_not_cached(self, monitor: GCPCostMonitor) -> None:
+        """测试扫描量超限返回明确提示，且不作为配置错误缓存"""
+        monitor.MAX_BYTES_BILLED = 10 * 1024**3
+        with (
+            patch.object(monitor, "_get_bigquery_client"),
+            patch.object(
+                monitor,
+                "_query_cost_rows",
+                side_effect=Exception("Query exceeded limit for bytes billed: 10737418240."),
+            ),
+        ):
+            result = monitor._fetch_cost_from_bigquery('{"type": "x"}', "p.d.t")
+
+        assert "扫描量超过上限 (10 GiB)" in (result.raw_error or "")
+        assert monitor._error_cache is None
+
+    def test_rate_limit_error_not_cached(self, monitor: GCPCostMonitor) -> None:
+        """测试限流/配额类 403 不被识别为权限不足，也不作为配置错误缓存"""
+        with (
+            patch.object(monitor, "_get_bigquery_client"),
+            patch.object(
+                monitor,
+                "_query_cost_rows",
+                side_effect=Exception("403 Exceeded rate limits: rateLimitExceeded"),
+            ),
+        ):
+            result = monitor._fetch_cost_from_bigquery('{"type": "x"}', "p.d.t")
+
+        assert "权限不足" not in (result.raw_error or "")
+        assert "限流或配额" in (result.raw_error or "")
+        assert monitor._error_cache is None
+
+    def test_partition_filter_by_table_type(self, monitor: GCPCostMonitor) -> None:
+        """测试仅对按导入时间分区的表使用 _PARTITIONTIME 过滤，且每张表只查询一次元数据"""
+        client = MagicMock()
+        client.get_table.return_value = SimpleNamespace(
+            time_partitioning=SimpleNamespace(field=None)
+        )
+        ingestion = monitor._get_partition_filter(client, "p.d.ingestion")
+        assert "_PARTITIONTIME" in ingestion
+        assert monitor._get_partition_filter(client, "p.d.ingestion") == ingestion
+        client.get_table.assert_called_once()
+
+        client.get_table.return_value = SimpleNamespace(
+            time_partitioning=SimpleNamespace(field="export_time")
+        )
+        assert "_PARTITIONTIME" not in monitor._get_partition_filter(client, "p.d.column")
+
+        client.get_table.return_value = SimpleNamespace(time_partitioning=None)
+        view_filter = monitor._get_partition_filter(client, "p.d.view")
+        assert "_PARTITIONTIME" not in view_filter
+        assert "export_time" in view_filter
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_invalid_table(self) -> None:
+        """测试导出表名格式无效时不执行查询"""
+        monitor = GCPCostMonitor(
+            service_id="test",
+            alias="测试",
+            credentials={
+                "service_account_json": '{"type": "service_account", "project_id": "test"}',
+                "gcp_bigquery_table": "dataset.table` WHERE 1=1 --",
+            },
+        )
+        result = await monitor.fetch_data()
+        assert result.overall_status == "error"
+        assert "格式无效" in (result.raw_error or "")
+
     @pytest.mark.asyncio
     async def test_fetch_data_missing_service_account(self) -> None:
         """测试缺少服务账号配置"""
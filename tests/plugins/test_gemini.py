@@ -2,12 +2,19 @@
 Gemini 插件单元测试
 """
 
-from unittest.mock import MagicMock, patch
+from collections.abc import AsyncIterator, Iterable
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from core.models import MetricData, MonitorResult
-from plugins.gemini.quota import GeminiQuotaMonitor
+from plugins.gemini.quota import HTTP_OPTIONS, MAX_MODEL_DETAILS, GeminiQuotaMonitor
+
+
+async def _async_pager(models: Iterable[MagicMock]) -> AsyncIterator[MagicMock]:
+    """模拟 client.aio.models.list() 返回的异步分页器"""
+    for model in models:
+        yield model
 
 
 class TestGeminiQuotaMonitor:
@@ -52,8 +59,8 @@ class TestGeminiQuotaMonitor:
         with patch("plugins.gemini.quota.genai.Client") as mock_client_class:
             mock_client = MagicMock()
             # 模拟 API 错误
-            mock_client.models.list.side_effect = Exception(
-                "API_KEY invalid or PERMISSION denied"
+            mock_client.aio.models.list = AsyncMock(
+                side_effect=Exception("API_KEY invalid or PERMISSION denied")
             )
             mock_client_class.return_value = mock_client
 
@@ -87,7 +94,9 @@ class TestGeminiQuotaMonitor:
 
         with patch("plugins.gemini.quota.genai.Client") as mock_client_class:
             mock_client = MagicMock()
-            mock_client.models.list.return_value = [mock_model1, mock_model2, mock_model3]
+            mock_client.aio.models.list = AsyncMock(
+                return_value=_async_pager([mock_model1, mock_model2, mock_model3])
+            )
             mock_client_class.return_value = mock_client
 
             result = await monitor.fetch_data()
@@ -96,6 +105,44 @@ class TestGeminiQuotaMonitor:
         # 第一个指标是可用模型数量
         assert result.metrics[0].value == "2"  # 只有两个模型支持 generateContent
 
+    @pytest.mark.asyncio
+    async def test_fetch_data_limits_model_details(self, monitor: GeminiQuotaMonitor) -> None:
+        """测试流式遍历模型列表时只保留前 MAX_MODEL_DETAILS 个模型详情"""
+        models = []
+        for i in range(MAX_MODEL_DETAILS + 3):
+            model = MagicMock()
+            model.name = f"models/gemini-{i}"
+            model.supported_generation_methods = ["generateContent"]
+            model.input_token_limit = 32000
+            model.output_token_limit = 8192
+            models.append(model)
+
+        with patch("plugins.gemini.quota.genai.Client") as mock_client_class:
+            mock_client_class.return_value.aio.models.list = AsyncMock(
+                return_value=_async_pager(models)
+            )
+            result = await monitor.fetch_data()
+
+        assert result.metrics[0].value == str(len(models))
+        assert len(result.metrics) == 2 + MAX_MODEL_DETAILS
+        assert result.metrics[2].value == "32K/8K"
+
+    @pytest.mark.asyncio
+    async def test_client_reused_across_fetches(self, monitor: GeminiQuotaMonitor) -> None:
+        """测试多次轮询复用同一个客户端，API Key 变化时重建"""
+        with patch("plugins.gemini.quota.genai.Client") as mock_client_class:
+            mock_client_class.return_value.aio.models.list = AsyncMock(
+                side_effect=lambda **_: _async_pager([])
+            )
+            await monitor.fetch_data()
+            await monitor.fetch_data()
+            assert mock_client_class.call_count == 1
+
+            monitor.credentials["api_key"] = "new-api-key"
+            await monitor.fetch_data()
+            assert mock_client_class.call_count == 2
+            mock_client_class.assert_called_with(api_key="new-api-key", http_options=HTTP_OPTIONS)
+
     def test_render_card(self, monitor: GeminiQuotaMonitor) -> None:
         """测试渲染卡片"""
         data = MonitorResult(
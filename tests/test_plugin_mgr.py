@@ -2,6 +2,7 @@
 插件管理器单元测试
 """
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -69,6 +70,20 @@ class TestRegisterPlugin:
         # 清理
         del PLUGIN_REGISTRY["test_plugin"]
 
+    def test_register_plugin_duplicate_type(self) -> None:
+        """测试同一插件类型重复注册为其他类时报错"""
+        register_plugin("test_duplicate")(MockMonitor)
+        try:
+            with pytest.raises(ValueError, match="test_duplicate"):
+
+                @register_plugin("test_duplicate")
+                class DuplicatePlugin(MockMonitor):
+                    pass
+
+            assert PLUGIN_REGISTRY["test_duplicate"] is MockMonitor
+        finally:
+            del PLUGIN_REGISTRY["test_duplicate"]
+
 
 class TestPluginManager:
     """PluginManager 测试类"""
@@ -194,6 +209,114 @@ class TestPluginManager:
         result = await plugin_mgr.refresh_single_service("nonexistent")
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_refresh_coalesces_concurrent_calls(self) -> None:
+        """测试并发刷新共享同一次 fetch_data"""
+        calls = 0
+
+        class SlowMonitor(MockMonitor):
+            async def fetch_data(self) -> MonitorResult:
+                nonlocal calls
+                calls += 1
+                await asyncio.sleep(0.01)
+                return await super().fetch_data()
+
+        monitor = SlowMonitor("slow", "慢服务", {"api_key": "k"})
+        monitor.REFRESH_TTL = 0.0
+        first, second = await asyncio.gather(monitor.refresh(), monitor.refresh())
+
+        assert calls == 1
+        assert first is second
+
+        await monitor.refresh()
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_reuses_recent_result(self) -> None:
+        """测试 REFRESH_TTL 内重复刷新复用上次成功结果，出错时不复用"""
+        monitor = MockMonitor("mock", "服务", {"api_key": "k"})
+
+        with patch.object(monitor, "fetch_data", wraps=monitor.fetch_data) as mock_fetch:
+            first = await monitor.refresh()
+            assert await monitor.refresh() is first
+            assert mock_fetch.call_count == 1
+
+            monitor._last_fetched_at -= monitor.REFRESH_TTL
+            await monitor.refresh()
+            assert mock_fetch.call_count == 2
+
+        with patch.object(
+            monitor, "fetch_data", return_value=monitor._create_error_result("失败")
+        ) as mock_fetch:
+            monitor._last_fetched_at -= monitor.REFRESH_TTL
+            await monitor.refresh()
+            await monitor.refresh()
+            assert mock_fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_records_result_when_caller_cancelled(self) -> None:
+        """测试等待方被取消时，完成的获取结果仍被后续刷新复用"""
+        monitor = MockMonitor("mock", "服务", {"api_key": "k"})
+        first = await monitor.refresh()
+        monitor._last_fetched_at -= monitor.REFRESH_TTL
+
+        release = asyncio.Event()
+        second = monitor._create_success_result(
+            [MetricData(label="测试", value="200", status="normal")]
+        )
+
+        async def slow_fetch() -> MonitorResult:
+            await release.wait()
+            return second
+
+        with patch.object(monitor, "fetch_data", side_effect=slow_fetch):
+            caller = asyncio.create_task(monitor.refresh())
+            await asyncio.sleep(0)
+            caller.cancel()
+            release.set()
+            await monitor._inflight
+
+        result = await monitor.refresh()
+        assert result is second
+        assert result is not first
+
+    @pytest.mark.asyncio
+    async def test_poll_delay_backs_off_when_unchanged(self) -> None:
+        """测试数据未变化时轮询间隔翻倍，变化后恢复"""
+        monitor = MockMonitor("mock", "服务", {"api_key": "k"})
+        monitor.REFRESH_TTL = 0.0
+        monitor.ADAPTIVE_POLLING = True
+        assert monitor.is_poll_due(60)
+
+        await monitor.refresh()
+        assert monitor.next_poll_delay(60) == 60
+        assert not monitor.is_poll_due(60)
+
+        await monitor.refresh()
+        await monitor.refresh()
+        assert monitor.next_poll_delay(60) == 240
+        assert monitor.next_poll_delay(1800) == MockMonitor.MAX_POLL_INTERVAL
+
+        with patch.object(
+            monitor,
+            "fetch_data",
+            return_value=monitor._create_success_result(
+                [MetricData(label="测试", value="200", status="normal")]
+            ),
+        ):
+            await monitor.refresh()
+        assert monitor.next_poll_delay(60) == 60
+
+    @pytest.mark.asyncio
+    async def test_poll_delay_fixed_by_default(self) -> None:
+        """测试未启用 ADAPTIVE_POLLING 时始终使用基础间隔"""
+        monitor = MockMonitor("mock", "服务", {"api_key": "k"})
+        monitor.REFRESH_TTL = 0.0
+
+        for _ in range(3):
+            await monitor.refresh()
+        assert monitor.next_poll_delay(60) == 60
+
     def test_update_service_credentials(self, plugin_mgr: PluginManager) -> None:
         """测试更新服务凭据"""
         plugin_mgr._loaded = True
@@ -16,6 +16,10 @@ STATUS_COLORS = {
     "warning": ft.Colors.AMBER,
     "error": ft.Colors.RED,
 }
+# 卡片通用样式，供各插件的 render_card 共享，避免每次渲染重复构建
+CARD_BGCOLOR = ft.Colors.with_opacity(0.1, ft.Colors.WHITE)
+ERROR_CARD_BGCOLOR = ft.Colors.with_opacity(0.1, ft.Colors.RED)
+KPI_PADDING = ft.Padding.symmetric(vertical=10)
 
 
 class SkeletonCard(ft.Container):
@@ -139,12 +143,14 @@ class MonitorCard(ft.Container):
         self.on_edit_callback = on_edit
         self.accent_color = accent_color
         self._show_skeleton = show_skeleton
+        # (数据指纹, 数据内容控件)，刷新结果未变化时复用，避免重建控件树
+        self._content_cache: tuple[int, ft.Control] | None = None
 
         super().__init__(
             content=self._build_content(),
             padding=16,
             border_radius=12,
-            bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.WHITE),
+            bgcolor=CARD_BGCOLOR,
             border=ft.Border.all(1, ft.Colors.with_opacity(0.2, self._get_status_color())),
             animate=ft.Animation(200, ft.AnimationCurve.EASE_IN_OUT),
         )
@@ -343,7 +349,7 @@ class MonitorCard(ft.Container):
                 ],
                 spacing=2,
             ),
-            padding=ft.Padding.symmetric(vertical=10),
+            padding=KPI_PADDING,
         )
 
     def _build_metrics(self) -> list[ft.Control]:
@@ -409,11 +415,25 @@ class MonitorCard(ft.Container):
             color=ft.Colors.WHITE_38,
         )
 
+    @staticmethod
+    def _data_key(data: MonitorResult) -> int:
+        """计算卡片内容所依赖数据的指纹"""
+        return hash(
+            (
+                data.raw_error,
+                data.last_updated,
+                tuple((m.label, m.value, m.unit, m.status) for m in data.metrics),
+            )
+        )
+
     def update_data(self, data: MonitorResult) -> None:
-        """更新卡片数据"""
+        """更新卡片数据，数据与上次展示一致时复用已构建的内容控件"""
         self.data = data
         self._show_skeleton = False
-        self.content = self._build_content()
+        key = self._data_key(data)
+        if self._content_cache is None or self._content_cache[0] != key:
+            self._content_cache = (key, self._build_content())
+        self.content = self._content_cache[1]
         self.border = ft.Border.all(1, ft.Colors.with_opacity(0.2, self._get_status_color()))
         self.update()
 
@@ -5,6 +5,7 @@
 """
 
 import asyncio
+import logging
 from typing import Any
 
 import flet as ft
@@ -16,6 +17,8 @@ from plugins.interface import BaseMonitor
 from ui.components.card import EmptyCard, MonitorCard
 from ui.components.nav import PageHeader
 
+logger = logging.getLogger(__name__)
+
 # 自动刷新间隔选项 (秒)
 REFRESH_INTERVALS = [
     (60, "1 分钟"),
@@ -169,27 +172,39 @@ class DashboardPage(ft.Container):
         else:
             return ft.Colors.BLUE_400
 
-    async def _refresh_all_async(self) -> None:
-        """异步并发刷新所有服务"""
+    async def _refresh_all_async(self, only_due: bool = False) -> None:
+        """
+        异步并发刷新所有服务
+
+        Args:
+            only_due: 仅刷新到达轮询时间的服务（自动刷新时使用，数据长期未变化的服务
+                会逐步降低轮询频率）
+        """
         if self._is_refreshing:
             return
 
+        monitors = [
+            monitor
+            for monitor in self.monitors
+            if monitor.enabled
+            and (not only_due or monitor.is_poll_due(self._auto_refresh_interval))
+        ]
+        if not monitors:
+            return
+
         self._is_refreshing = True
 
         # 发布刷新开始事件
         await self._event_bus.publish(Event(type=EventType.REFRESH_STARTED))
 
-        # 显示所有卡片的加载状态
-        for card in self.cards.values():
-            card.show_loading()
+        # 显示待刷新卡片的加载状态
+        for monitor in monitors:
+            if monitor.service_id in self.cards:
+                self.cards[monitor.service_id].show_loading()
         self.app_page.update()
 
         # 并发刷新所有服务
-        tasks = []
-        for monitor in self.monitors:
-            if monitor.enabled:
-                tasks.append(self._refresh_monitor(monitor))
-
+        tasks = [self._refresh_monitor(monitor) for monitor in monitors]
         await asyncio.gather(*tasks)
 
         self._is_refreshing = False
@@ -216,7 +231,7 @@ class DashboardPage(ft.Container):
             )
 
         except Exception as e:
-            print(f"Error refreshing {monitor.service_id}: {e}")
+            logger.warning("Error refreshing %s: %s", monitor.service_id, e)
             # 更新卡片为错误状态
             if monitor.service_id in self.cards:
                 error_result = monitor._create_error_result(f"刷新失败: {e!s}")
@@ -241,13 +256,13 @@ class DashboardPage(ft.Container):
                 if self._auto_refresh_interval <= 0:
                     break
 
-                # 执行刷新
-                await self._refresh_all_async()
+                # 执行刷新（跳过数据长期未变化、尚未到达退避间隔的服务）
+                await self._refresh_all_async(only_due=True)
 
             except asyncio.CancelledError:
                 break
-            except Exception as e:
-                print(f"Auto refresh error: {e}")
+            except Exception:
+                logger.exception("Auto refresh error")
 
     def _start_auto_refresh(self) -> None:
         """启动自动刷新"""